@@ -0,0 +1,78 @@
+"""Headless check of the NumPy analyzer against a committed WAV fixture.
+
+Feeds `tone_440.wav` (a steady 440 Hz sine) through NumpyBackend and checks
+that the loudest bar of the last frame is the one whose frequency band holds
+440 Hz. Exits 1 otherwise.
+
+    python -m benchmarks.check_analyzer
+    python -m benchmarks.check_analyzer --regenerate   # rewrite the fixture
+"""
+
+import argparse
+import asyncio
+import math
+import struct
+import sys
+import wave
+from pathlib import Path
+
+FIXTURE = Path(__file__).resolve().parent / "tone_440.wav"
+TONE_HZ = 440
+SAMPLE_RATE = 22050
+SECONDS = 0.25
+BARS = 40
+
+
+def write_tone(path, freq=TONE_HZ, sample_rate=SAMPLE_RATE, seconds=SECONDS):
+    """Write a mono 16-bit sine at half scale."""
+    samples = (
+        int(16383 * math.sin(2 * math.pi * freq * i / sample_rate))
+        for i in range(int(sample_rate * seconds))
+    )
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"".join(struct.pack("<h", s) for s in samples))
+
+
+async def last_frame(backend):
+    frame = None
+    async for frame in backend.frames():
+        pass
+    return frame
+
+
+def expected_bar(backend, freq):
+    """Index of the bar whose FFT bins contain `freq`."""
+    peak_bin = round(freq / (backend.sample_rate / backend.window))
+    edges = list(backend._bin_edges())
+    for bar, (start, end) in enumerate(zip(edges, edges[1:])):
+        if start <= peak_bin < end:
+            return bar
+    raise ValueError(f"{freq} Hz is outside the analyzed range")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--regenerate", action="store_true")
+    args = parser.parse_args()
+    if args.regenerate:
+        write_tone(FIXTURE)
+        print(f"Wrote {FIXTURE}")
+
+    from textual_app.numpy_backend import NumpyBackend
+
+    backend = NumpyBackend(FIXTURE, bars=BARS)
+    frame = asyncio.run(last_frame(backend))
+    if not frame:
+        print("The analyzer produced no frames")
+        return 1
+    loudest = max(range(len(frame)), key=frame.__getitem__)
+    expected = expected_bar(backend, TONE_HZ)
+    print(f"loudest bar {loudest}, expected {expected} ({TONE_HZ} Hz)")
+    return 0 if loudest == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Stand-in for the cava binary: emits synthetic raw frames at a fixed rate.
+
+Invoked as `cava -p CONFIG` through a wrapper script the benchmark puts on
+PATH. Reads `bars` and `bit_format` from the config and writes that many
+samples per frame to stdout at FAKE_CAVA_FPS frames per second.
+"""
+
+import math
+import os
+import re
+import sys
+import time
+
+
+def main():
+    with open(sys.argv[sys.argv.index("-p") + 1]) as f:
+        config = f.read()
+    bars = int(re.search(r"bars = (\d+)", config)[1])
+    wide = "16bit" in config
+    fps = float(os.environ.get("FAKE_CAVA_FPS", 60))
+    scale = 65535 if wide else 255
+
+    out = sys.stdout.buffer
+    frame = 0
+    next_at = time.monotonic()
+    while True:
+        # A travelling wave, so consecutive frames differ like real audio
+        levels = [
+            int(scale * (0.5 + 0.5 * math.sin((bar + frame) / 4)))
+            for bar in range(bars)
+        ]
+        if wide:
+            data = b"".join(level.to_bytes(2, sys.byteorder) for level in levels)
+        else:
+            data = bytes(levels)
+        try:
+            out.write(data)
+            out.flush()
+        except BrokenPipeError:
+            return
+        frame += 1
+        next_at += 1 / fps
+        time.sleep(max(next_at - time.monotonic(), 0))
+
+
+if __name__ == "__main__":
+    main()
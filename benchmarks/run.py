@@ -0,0 +1,308 @@
+"""Headless benchmark of TuxApp's hot paths.
+
+Runs the full app under Textual's test pilot against a fake cava that emits
+frames at a fixed rate, a large TODO list and a local GitHub stand-in. Records
+latency percentiles for each hot path, plus CPU time and peak memory.
+
+    python -m benchmarks.run --save   # record a baseline
+    python -m benchmarks.run          # compare against it, exit 1 on regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Differences smaller than these are noise, whatever the relative change
+ABSOLUTE_FLOOR = {"ms": 0.05, "cpu_seconds": 0.1, "max_rss_mb": 5}
+# Percentiles over fewer calls than this are too noisy to gate on
+MIN_SAMPLES = 20
+# Typed one prefix at a time, as the search box reports each keystroke
+SEARCH_QUERY = "item 12"
+
+
+class Recorder:
+    """Times calls to methods patched onto their classes."""
+
+    def __init__(self):
+        self.samples = {}
+
+    def wrap(self, cls, name, label=None):
+        original = getattr(cls, name)
+        samples = self.samples.setdefault(label or f"{cls.__name__}.{name}", [])
+
+        if asyncio.iscoroutinefunction(original):
+
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - started)
+
+        else:
+
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - started)
+
+        setattr(cls, name, timed)
+
+    def summary(self):
+        result = {}
+        for label, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+
+            def pct(p):
+                return ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)]
+
+            result[label] = {
+                "count": len(ordered),
+                "p50_ms": round(pct(50) * 1000, 4),
+                "p95_ms": round(pct(95) * 1000, 4),
+                "p99_ms": round(pct(99) * 1000, 4),
+                "max_ms": round(ordered[-1] * 1000, 4),
+            }
+        return result
+
+
+def prepare_environment(root, api_url, repos, fps):
+    """Point the app at a throwaway config dir, the stand-in and the fake cava."""
+    config_dir = root / "tuxagotchi"
+    config_dir.mkdir(parents=True)
+    repo_list = ", ".join(f'"repo-{i}"' for i in range(repos))
+    (config_dir / "config.toml").write_text(f"""[github]
+username = "bench"
+repo = "repo-0"
+token = ""
+repos = [{repo_list}]
+api_url = "{api_url}"
+min_interval = 600
+
+[cava]
+fps = {fps}
+""")
+
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    cava = bin_dir / "cava"
+    cava.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" "{BENCH_DIR / "fake_cava.py"}" "$@"\n'
+    )
+    cava.chmod(0o755)
+
+    os.environ["XDG_CONFIG_HOME"] = str(root)
+    # Keeps the app standalone even if a tuxd is running
+    os.environ["XDG_RUNTIME_DIR"] = str(root)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    os.environ["FAKE_CAVA_FPS"] = str(fps)
+
+
+async def drive(app, recorder, args):
+    """Exercise the app with `args.keys` key events and return the results.
+
+    Keys go straight to the TODO widget rather than through the pilot, which
+    waits for the app to go idle after each press; with animation timers
+    running that takes seconds and would starve the run of samples.
+    """
+    from textual.events import Key
+    from github_poller import GitHubPoller
+    from textual_app.cava_widget import CavaWidget
+    from textual_app.todo_list import TodoList
+    from textual_app.todo_widget import TodoWidget
+    from textual_app.tux_widget import TuxWidget
+
+    recorder.wrap(TuxWidget, "render")
+    recorder.wrap(CavaWidget, "paint_frame")
+    recorder.wrap(TodoWidget, "on_key")
+    recorder.wrap(TodoWidget, "filter")
+    recorder.wrap(TodoList, "render_line")
+    recorder.wrap(GitHubPoller, "_poll", "GitHubPoller.poll")
+
+    def key(name, character=None):
+        return Key(name, character)
+
+    async with app.run_test(size=(120, 50)) as pilot:
+        # Let the first paint and the deferred GitHub setup happen
+        await pilot.pause(0.5)
+        await pilot.press("escape")
+        todo = app.todo_widget
+        poll_every = max(args.keys // args.polls, 1)
+
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for step in range(args.keys):
+            if step % poll_every == 0:
+                await app.poller._poll()
+            # Animate Tux and walk the list the way a user would
+            app.tux_widget.increment_tick()
+            name = "j" if step % 10 < 7 else "k"
+            await todo.on_key(key(name, name))
+            if step % 50 == 49:
+                await todo.on_key(key("slash", "/"))
+                for end in range(1, len(SEARCH_QUERY) + 1):
+                    todo.filter(SEARCH_QUERY[:end])
+                await todo.on_key(key("escape"))
+            # Yield so paints, cava frames and timers run between keys
+            await asyncio.sleep(1 / args.key_rate)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        frames = app.cava_widget.frame_stats()
+
+    return {
+        "hot_paths": recorder.summary(),
+        "cpu_seconds": round(cpu, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "cava_frames": frames,
+        "params": {
+            "keys": args.keys,
+            "polls": args.polls,
+            "todos": args.todos,
+            "repos": args.repos,
+            "fps": args.fps,
+        },
+    }
+
+
+def undersampled(results):
+    """Return the hot paths with too few calls for their percentiles to mean much."""
+    return [
+        label
+        for label, stats in results["hot_paths"].items()
+        if stats["count"] < MIN_SAMPLES
+    ]
+
+
+def flatten(results):
+    """Map each compared metric to (value, unit) for regression checks."""
+    metrics = {
+        "cpu_seconds": (results["cpu_seconds"], "cpu_seconds"),
+        "max_rss_mb": (results["max_rss_mb"], "max_rss_mb"),
+    }
+    for label, stats in results["hot_paths"].items():
+        for key in ("p50_ms", "p95_ms"):
+            metrics[f"{label}.{key}"] = (stats[key], "ms")
+    return metrics
+
+
+def compare(results, baseline, threshold):
+    """Print current vs. baseline and return the metrics that regressed."""
+    current = flatten(results)
+    regressions = []
+    for name, (base, unit) in flatten(baseline).items():
+        if name not in current:
+            continue
+        value = current[name][0]
+        change = (value - base) / base if base else 0.0
+        regressed = (
+            value > base * (1 + threshold) and value - base > ABSOLUTE_FLOOR[unit]
+        )
+        flag = "REGRESSED" if regressed else ""
+        print(f"{name:<40}{base:>12.4f}{value:>12.4f}{change:>+9.1%}  {flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1000, help="key events sent")
+    parser.add_argument("--todos", type=int, default=50000)
+    parser.add_argument("--repos", type=int, default=50)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument(
+        "--key-rate", type=float, default=200, help="max keys per second"
+    )
+    parser.add_argument("--polls", type=int, default=20, help="GitHub polls made")
+    parser.add_argument(
+        "--api-latency", type=float, default=0.0, help="stand-in latency, seconds"
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    parser.add_argument("--output", type=Path, help="also write results here")
+    args = parser.parse_args()
+
+    standin = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "github_standin",
+            "serve",
+            "--repos",
+            str(args.repos),
+            "--latency",
+            str(args.api_latency),
+        ],
+        cwd=BENCH_DIR.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        api_url = standin.stdout.readline().strip()
+        with tempfile.TemporaryDirectory() as tmp:
+            prepare_environment(Path(tmp), api_url, args.repos, args.fps)
+
+            # Imported only now so module-level paths pick up the temp config
+            from todo_store import TodoStore
+            from textual_app.app import TuxApp, generate_css_file
+
+            store = TodoStore()
+            for i in range(args.todos):
+                store.add(f"item {i}")
+            store.close()
+
+            generate_css_file()
+            results = asyncio.run(drive(TuxApp(), Recorder(), args))
+    finally:
+        standin.terminate()
+        standin.wait()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    short = undersampled(results)
+    if short and (args.save or args.baseline.exists()):
+        print(json.dumps(results, indent=2))
+        print(
+            f"Too few samples (< {MIN_SAMPLES}) for: {', '.join(short)}; "
+            "raise --keys or --polls"
+        )
+        return 2
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(json.dumps(results, indent=2))
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    print(f"{'metric':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
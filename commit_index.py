@@ -0,0 +1,65 @@
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+# Windows reported by `window_counts`
+WINDOWS = {
+    "24h": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+
+def parse_epoch(date_str):
+    """Epoch seconds of a GitHub "YYYY-MM-DDTHH:MM:SSZ" timestamp."""
+    # fromisoformat is C-fast; strptime would dominate parsing 100k commits
+    return int(datetime.fromisoformat(date_str[:-1] + "+00:00").timestamp())
+
+
+class CommitIndex:
+    """Commit author times as a sorted list of epoch seconds.
+
+    Times are parsed once. Each windowed count is then two bisects, and
+    per-day counts for a heatmap are one bisect per day boundary.
+    """
+
+    def __init__(self, times=()):
+        self.times = sorted(times)
+
+    @classmethod
+    def from_commits(cls, commits):
+        """Build from raw commit objects as returned by the REST API."""
+        return cls(parse_epoch(c["commit"]["author"]["date"]) for c in commits)
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, times):
+        new = sorted(times)
+        if not new:
+            return
+        if not self.times or new[0] >= self.times[-1]:
+            self.times.extend(new)
+        else:
+            # Timsort merges the two sorted runs in linear time
+            self.times = sorted(self.times + new)
+
+    def count_since(self, since):
+        """Count commits at or after `since`, a tz-aware datetime."""
+        return len(self.times) - bisect_left(self.times, since.timestamp())
+
+    def window_counts(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        return {name: self.count_since(now - span) for name, span in WINDOWS.items()}
+
+    def daily_counts(self, first_day, last_day):
+        """Commits per local calendar day from `first_day` to `last_day`."""
+        days = (last_day - first_day).days + 1
+        # Local midnights via mktime, so DST days keep their real length
+        boundaries = [
+            time.mktime((first_day + timedelta(days=i)).timetuple())
+            for i in range(days + 1)
+        ]
+        # Every day is binned at once by locating its boundaries in the index
+        edges = [bisect_left(self.times, b) for b in boundaries]
+        return [end - start for start, end in zip(edges, edges[1:])]
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from config import get_config_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    authored_at INTEGER NOT NULL,
+    committed_at INTEGER NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+CREATE INDEX IF NOT EXISTS commits_authored ON commits (authored_at);
+CREATE INDEX IF NOT EXISTS commits_committed ON commits (repo, committed_at);
+-- Ranges of history not fetched yet, left by a sync that hit its page cap
+-- or by history_days growing. `page` is where fetching the range resumes
+CREATE TABLE IF NOT EXISTS sync_gaps (
+    repo TEXT NOT NULL,
+    since INTEGER NOT NULL,
+    until INTEGER NOT NULL,
+    page INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (repo, since)
+);
+-- Start of the window each repo's history has been synced from
+CREATE TABLE IF NOT EXISTS sync_start (
+    repo TEXT PRIMARY KEY,
+    since INTEGER NOT NULL
+);
+"""
+
+
+def _epoch(date_str):
+    return int(
+        datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+class CommitStore:
+    """Local SQLite history of commits, synced incrementally from GitHub."""
+
+    def __init__(self, path=None):
+        self.path = path or get_config_dir() / "commits.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Writes happen in a worker thread, reads on the event loop
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(sync_gaps)")]
+        if "page" not in columns:
+            # Stores from before gaps kept a resume page
+            self._conn.execute(
+                "ALTER TABLE sync_gaps ADD COLUMN page INTEGER NOT NULL DEFAULT 1"
+            )
+
+    def newest_commit_time(self, repo):
+        """Return the newest stored committer date for a repo, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(committed_at) FROM commits WHERE repo = ?", (repo,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return datetime.fromtimestamp(row[0], tz=timezone.utc)
+
+    def add_commits(self, repo, commits):
+        """Insert raw commit objects from the API, skipping ones already stored.
+
+        Returns the author times, in epoch seconds, of the commits added.
+        """
+        rows = [
+            (
+                repo,
+                c["sha"],
+                _epoch(c["commit"]["author"]["date"]),
+                _epoch(c["commit"]["committer"]["date"]),
+            )
+            for c in commits
+        ]
+        added = []
+        with self._lock, self._conn:
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?)", row
+                )
+                if cursor.rowcount:
+                    added.append(row[2])
+        return added
+
+    def gaps(self, repo):
+        """Return the unfetched (since, until, page) ranges of a repo, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT since, until, page FROM sync_gaps WHERE repo = ?"
+                " ORDER BY until DESC",
+                (repo,),
+            ).fetchall()
+        return [
+            (
+                datetime.fromtimestamp(since, tz=timezone.utc),
+                datetime.fromtimestamp(until, tz=timezone.utc),
+                page,
+            )
+            for since, until, page in rows
+        ]
+
+    def set_gap(self, repo, since, until, page=1):
+        """Record that commits from `since` to `until` are still to be fetched."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_gaps VALUES (?, ?, ?, ?)",
+                (repo, int(since.timestamp()), int(until.timestamp()), page),
+            )
+
+    def remove_gap(self, repo, since):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sync_gaps WHERE repo = ? AND since = ?",
+                (repo, int(since.timestamp())),
+            )
+
+    def sync_start(self, repo):
+        """Return the start of the window a repo was synced from, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT since FROM sync_start WHERE repo = ?", (repo,)
+            ).fetchone()
+        if row is None:
+            return None
+        return datetime.fromtimestamp(row[0], tz=timezone.utc)
+
+    def set_sync_start(self, repo, since):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_start VALUES (?, ?)",
+                (repo, int(since.timestamp())),
+            )
+
+    def authored_times(self, repos=None):
+        """Return every stored author time as epoch seconds, oldest first."""
+        query = "SELECT authored_at FROM commits"
+        params = []
+        if repos:
+            query += f" WHERE repo IN ({','.join('?' * len(repos))})"
+            params.extend(repos)
+        query += " ORDER BY authored_at"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
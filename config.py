@@ -1,9 +1,19 @@
 import os
+from functools import lru_cache
+from pathlib import Path
 import toml
 
 
+def get_config_dir() -> Path:
+    """Return the config directory path, respecting XDG_CONFIG_HOME or default."""
+    return (
+        Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "tuxagotchi"
+    )
+
+
+@lru_cache(maxsize=1)
 def load_config():
-    user_config_path = os.path.expanduser("~/.config/tuxagotchi/config.toml")
+    user_config_path = get_config_dir() / "config.toml"
 
     default_config_path = os.path.join(os.path.dirname(__file__), "config.toml")
 
@@ -22,4 +32,57 @@ def load_config():
         "highlight": colors.get("highlight", "red"),
         "todo_border": colors.get("todo_border", "red"),
     }
+
+    cava = config.get("cava", {})
+    config["cava"] = {
+        "bit_format": cava.get("bit_format", "8bit"),
+        "fps": cava.get("fps", 30),
+        "backend": cava.get("backend", "cava"),
+        "source": cava.get("source"),
+        "sample_rate": cava.get("sample_rate", 44100),
+        "channels": cava.get("channels", 2),
+    }
+
+    idle = config.get("idle", {})
+    config["idle"] = {
+        "silence_seconds": idle.get("silence_seconds", 2),
+        "unfocused_fps": idle.get("unfocused_fps", 5),
+        "stop_cava": idle.get("stop_cava", False),
+    }
+
+    metrics = config.get("metrics", {})
+    config["metrics"] = {
+        "textfile": metrics.get("textfile"),
+        "port": metrics.get("port"),
+        "interval": metrics.get("interval", 15),
+    }
+
+    daemon = config.get("daemon", {})
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    default_socket = (
+        Path(runtime_dir) / "tuxagotchi.sock"
+        if runtime_dir
+        else get_config_dir() / "tuxd.sock"
+    )
+    config["daemon"] = {
+        "socket": str(daemon.get("socket", default_socket)),
+        "bars": daemon.get("bars", 128),
+    }
     return config
+
+
+def get_repos(config):
+    """Return the configured repositories as "owner/name" strings.
+
+    Accepts the legacy single `repo` key as well as a `repos` list; bare repo
+    names are resolved against `username`.
+    """
+    github = config["github"]
+    username = github["username"]
+    names = github.get("repos") or ([github["repo"]] if github.get("repo") else [])
+    repos = []
+    for name in names:
+        full_name = name if "/" in name else f"{username}/{name}"
+        if full_name not in repos:
+            repos.append(full_name)
+    return repos
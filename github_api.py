@@ -1,30 +1,144 @@
-import requests
+import json
+import os
 from datetime import datetime, timezone
+from textual import log
+from config import get_config_dir
+
+CACHE_PATH = get_config_dir() / "github_cache.json"
+
+# Conditional request bookkeeping; 304 responses are served from here
+_response_cache = None
+_cache_dirty = False
+cache_stats = {"hits": 0, "misses": 0}
+
+
+def _load_cache():
+    global _response_cache
+    if _response_cache is None:
+        try:
+            with open(CACHE_PATH) as f:
+                _response_cache = json.load(f)
+        except (OSError, ValueError):
+            _response_cache = {}
+    return _response_cache
+
+
+def _save_cache():
+    global _cache_dirty
+    _cache_dirty = False
+    # Entries are replaced, never mutated, so a shallow copy is a consistent
+    # view even while the event loop keeps storing responses
+    cache = dict(_response_cache)
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def cache_key(url, params):
+    query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{url}?{query}"
+
+
+def _slim_commits(commits):
+    """Keep only the commit fields the app reads: sha, author and committer dates."""
+    return [
+        {
+            "sha": c["sha"],
+            "commit": {
+                "author": {"date": c["commit"]["author"]["date"]},
+                "committer": {"date": c["commit"]["committer"]["date"]},
+            },
+        }
+        for c in commits
+    ]
+
+
+def conditional_headers(key):
+    """Return If-None-Match / If-Modified-Since headers for a cached response."""
+    entry = _load_cache().get(key)
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def cached_response(key):
+    """Record a cache hit and return the stored payload for a 304 response."""
+    cache_stats["hits"] += 1
+    entry = _load_cache().get(key)
+    return entry["data"] if entry else []
+
+
+def store_response(key, headers, data, save=True):
+    """Record a cache miss and persist the validators of a 200 response.
+
+    Batch callers pass `save=False` and call `save_cache` once at the end;
+    async callers run it in a thread. Only the commit fields the app reads
+    are cached, which keeps the file and each save small.
+    """
+    global _cache_dirty
+    cache_stats["misses"] += 1
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    _load_cache()[key] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "data": _slim_commits(data),
+    }
+    _cache_dirty = True
+    if save:
+        save_cache()
+
+
+def save_cache():
+    if not _cache_dirty:
+        return
+    try:
+        _save_cache()
+    except OSError as e:
+        log("Failed to write response cache:", e)
+
+
+def get_cache_stats():
+    return dict(cache_stats)
 
 
 def get_recent_commits(username, repo, token=None, per_page=30):
     url = f"https://api.github.com/repos/{username}/{repo}/commits"
     params = {"per_page": per_page}
-    headers = {}
+    key = cache_key(url, params)
+    headers = conditional_headers(key)
 
     if token:
         headers["Authorization"] = f"token {token}"
 
+    # requests is slow to import and only needed by this synchronous path
+    import requests
+
     try:
         response = requests.get(url, params=params, headers=headers)
-        print(f"[DEBUG] Status code: {response.status_code}")
+        log("GitHub status", response.status_code, "for", url)
+        if response.status_code == 304:
+            return cached_response(key)
         response.raise_for_status()
         data = response.json()
-        print(f"[DEBUG] First commit payload: {data[0] if data else 'None'}")
+        store_response(key, response.headers, data)
         return data
     except Exception as e:
-        print(f"[DEBUG] Failed to fetch commits: {e}")
+        log("Failed to fetch commits:", e)
         return []
 
 
 def get_recent_commit_time(username, repo, token=None):
     commits = get_recent_commits(username, repo, token=token)
-    print(f"[DEBUG] Fetched commits for {username}/{repo}: {commits}")
+    log("Fetched", len(commits), "commits for", username, repo)
     if commits:
         commit_time = commits[0]["commit"]["committer"]["date"]
         return datetime.strptime(commit_time, "%Y-%m-%dT%H:%M:%SZ").replace(
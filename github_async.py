@@ -0,0 +1,268 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import aiohttp
+from textual import log
+
+from github_api import (
+    cache_key,
+    conditional_headers,
+    cached_response,
+    store_response,
+    save_cache,
+)
+from poll_scheduler import TokenPool
+from metrics import REGISTRY
+
+API_URL = "https://api.github.com"
+# GraphQL node limits allow roughly this many repositories per query
+GRAPHQL_BATCH = 100
+
+
+def parse_commit_date(commit_time):
+    return datetime.strptime(commit_time, "%Y-%m-%dT%H:%M:%SZ").replace(
+        tzinfo=timezone.utc
+    )
+
+
+def parse_commit_time(commit):
+    return parse_commit_date(commit["commit"]["committer"]["date"])
+
+
+def build_activity_query(repos, since):
+    """Build an aliased GraphQL query covering every "owner/name" in `repos`."""
+    params = ["$since: GitTimestamp!"]
+    fields = []
+    variables = {"since": since}
+    for i, full_name in enumerate(repos):
+        owner, name = full_name.split("/", 1)
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+        fields.append(
+            f"r{i}: repository(owner: $o{i}, name: $n{i}) {{"
+            " defaultBranchRef { target { ... on Commit {"
+            " committedDate history(since: $since) { totalCount } } } } }"
+        )
+    query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+    return query, variables
+
+
+class GitHubClient:
+    """Async GitHub client that keeps one pooled aiohttp session alive.
+
+    Requests rotate across `tokens` (or the single `token`) by remaining quota,
+    and every response's status and headers are passed to `on_response`.
+    """
+
+    def __init__(
+        self,
+        token=None,
+        timeout=10,
+        concurrency=8,
+        tokens=None,
+        on_response=None,
+        api_url=API_URL,
+    ):
+        # Overridable so a local stand-in can serve the API
+        self.api_url = api_url.rstrip("/")
+        self.token_pool = TokenPool(tokens or [token])
+        self.on_response = on_response
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.concurrency = concurrency
+        # Shared by every request so batch operations can't exceed the cap
+        self._limit = asyncio.Semaphore(concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency, keepalive_timeout=120
+            )
+            self._session = aiohttp.ClientSession(
+                headers={"Accept": "application/vnd.github+json"},
+                connector=connector,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    def _observe(self, status, headers, token):
+        REGISTRY.inc("tux_http_responses_total", status=str(status or "error"))
+        if headers is not None and "X-RateLimit-Remaining" in headers:
+            REGISTRY.set(
+                "tux_rate_limit_remaining", int(headers["X-RateLimit-Remaining"])
+            )
+        if self.on_response is not None:
+            self.on_response(status, headers, token)
+        else:
+            self.token_pool.observe(token, headers)
+
+    @asynccontextmanager
+    async def _request(self, method, url, params=None, headers=None, json=None):
+        token = self.token_pool.pick()
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"token {token}"
+        response = None
+        try:
+            async with self._get_session().request(
+                method, url, params=params, headers=headers, json=json
+            ) as response:
+                self._observe(response.status, response.headers, token)
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if response is None:
+                self._observe(None, None, token)
+            raise
+
+    def _get(self, url, params=None, headers=None):
+        return self._request("GET", url, params=params, headers=headers)
+
+    async def get_recent_commits(self, username, repo, per_page=30, save=True):
+        url = f"{self.api_url}/repos/{username}/{repo}/commits"
+        params = {"per_page": per_page}
+        key = cache_key(url, params)
+        headers = conditional_headers(key)
+
+        try:
+            async with self._get(url, params=params, headers=headers) as response:
+                if response.status == 304:
+                    return cached_response(key)
+                response.raise_for_status()
+                data = await response.json()
+                store_response(key, response.headers, data, save=False)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log("Failed to fetch commits:", e)
+            return []
+        if save:
+            # A full cache dump would stall the event loop
+            await asyncio.to_thread(save_cache)
+        return data
+
+    async def get_recent_commit_time(self, username, repo, save=True):
+        # Only the newest commit matters here, so keep the payload to one item
+        commits = await self.get_recent_commits(username, repo, per_page=1, save=save)
+        if commits:
+            return parse_commit_time(commits[0])
+        return None
+
+    async def get_commit_times(self, repos):
+        """Fetch the newest commit time of each "owner/name" concurrently.
+
+        At most `concurrency` requests are in flight at once. Returns a dict
+        mapping each repo to its commit time, or None if it couldn't be fetched.
+        """
+
+        async def fetch(full_name):
+            username, repo = full_name.split("/", 1)
+            async with self._limit:
+                return await self.get_recent_commit_time(username, repo, save=False)
+
+        times = await asyncio.gather(*(fetch(full_name) for full_name in repos))
+        await asyncio.to_thread(save_cache)
+        return dict(zip(repos, times))
+
+    async def get_repo_activity(self, repos, since):
+        """Fetch head commit time and commits since `since` for many repos.
+
+        Uses the GraphQL API, batching up to GRAPHQL_BATCH repos per request.
+        Returns a dict mapping each "owner/name" to a `(commit_time, count)`
+        tuple, with `(None, None)` for repos that couldn't be resolved.
+        """
+        batches = [
+            repos[i : i + GRAPHQL_BATCH] for i in range(0, len(repos), GRAPHQL_BATCH)
+        ]
+        activity = {repo: (None, None) for repo in repos}
+        since_str = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        async def fetch(batch):
+            query, variables = build_activity_query(batch, since_str)
+            try:
+                async with self._limit, self._request(
+                    "POST",
+                    f"{self.api_url}/graphql",
+                    json={"query": query, "variables": variables},
+                ) as response:
+                    response.raise_for_status()
+                    payload = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                log("GraphQL batch failed:", e)
+                return
+            data = payload.get("data") or {}
+            for i, repo in enumerate(batch):
+                node = data.get(f"r{i}") or {}
+                target = (node.get("defaultBranchRef") or {}).get("target") or {}
+                if "committedDate" in target:
+                    activity[repo] = (
+                        parse_commit_date(target["committedDate"]),
+                        target["history"]["totalCount"],
+                    )
+
+        await asyncio.gather(*(fetch(batch) for batch in batches))
+        return activity
+
+    async def get_commits_since(
+        self, full_name, since=None, until=None, max_pages=50, page=1
+    ):
+        """Fetch the commits of "owner/name" between `since` and `until`.
+
+        Pages through the results 100 at a time, newest first, from `page` up
+        to `max_pages` pages. Returns `(commits, complete)`; `complete` is False
+        when the page cap or a failure left older commits in the range unfetched.
+        """
+        url = f"{self.api_url}/repos/{full_name}/commits"
+        params = {"per_page": 100}
+        if page > 1:
+            params["page"] = page
+        if since is not None:
+            params["since"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+        if until is not None:
+            params["until"] = until.strftime("%Y-%m-%dT%H:%M:%SZ")
+        commits = []
+        try:
+            for _ in range(max_pages):
+                async with self._limit, self._get(url, params=params) as response:
+                    response.raise_for_status()
+                    commits.extend(await response.json())
+                    next_link = response.links.get("next")
+                if not next_link:
+                    return commits, True
+                url = str(next_link["url"])
+                params = None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # A partial page set would leave a gap behind the newest commits,
+            # so drop it and let the next poll retry from the same point
+            log("Failed to sync commits for", full_name, e)
+            return [], False
+        log("Commit sync for", full_name, "hit the cap of", max_pages, "pages")
+        return commits, False
+
+    async def list_repos(self, owner):
+        """Return "owner/name" for every public repo of a user or organization.
+
+        Returns None if any page failed, rather than a partial list.
+        """
+        url = f"{self.api_url}/users/{owner}/repos"
+        params = {"per_page": 100, "type": "owner", "sort": "pushed"}
+        repos = []
+        try:
+            while url:
+                async with self._get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+                    repos.extend(item["full_name"] for item in data)
+                    next_link = response.links.get("next")
+                    url = str(next_link["url"]) if next_link else None
+                    # The next link already carries the query string
+                    params = None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log("Failed to list repos for", owner, e)
+            return None
+        return repos
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,225 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from textual import log
+
+from commit_store import CommitStore
+from github_api import get_cache_stats
+from github_async import API_URL, GRAPHQL_BATCH, GitHubClient, parse_commit_time
+from metrics import REGISTRY
+from poll_scheduler import PollScheduler
+
+# Pages of 100 commits one sync of a repo or a gap may fetch
+SYNC_PAGES = 50
+
+
+class GitHubPoller:
+    """Keeps a Tux's commit state current by polling GitHub.
+
+    Owns the API client, poll scheduler and commit store. `run()` polls right
+    away and then at the scheduler's pace. After every completed poll, it
+    awaits `on_poll(new_commit, index_changed)`.
+    """
+
+    def __init__(self, config, tux, on_poll=None):
+        github = config["github"]
+        self.tux = tux
+        self.username = github["username"]
+        # Shared with Tux, so repos found through `all_repos` show up there too
+        self.repos = tux.repos
+        self.all_repos = github.get("all_repos", False)
+        self.client = GitHubClient(
+            token=github["token"],
+            tokens=github.get("tokens"),
+            concurrency=github.get("concurrency", 8),
+            on_response=self.on_response,
+            api_url=github.get("api_url", API_URL),
+        )
+        self.scheduler = PollScheduler(
+            self.client.token_pool,
+            min_interval=github.get("min_interval", 10),
+            base_interval=github.get("poll_interval", 60),
+            max_interval=github.get("max_interval", 600),
+        )
+        self.store = CommitStore()
+        tux.store = self.store
+        self.history_days = github.get("history_days", 30)
+        # "graphql" batches all repos into one query but requires a token
+        self.backend = github.get("backend", "rest")
+        self.on_poll = on_poll
+        self.last_poll = None
+        # Per repo, which of its gaps the next poll works on
+        self._gap_turn = {}
+        self._last_commit_time = tux.last_commit_time
+
+    def on_response(self, status, headers, token) -> None:
+        self.scheduler.observe(status, headers, token)
+
+    def poll_cost(self) -> int:
+        """Number of API requests one poll makes."""
+        if self.backend == "graphql":
+            return -(-len(self.repos) // GRAPHQL_BATCH)
+        return len(self.repos)
+
+    def next_delay(self) -> float:
+        return self.scheduler.next_delay(
+            since_commit=self.tux.time_since_commit(),
+            until_next_mood=self.tux.time_until_next_mood(),
+            cost=self.poll_cost(),
+        )
+
+    async def resolve_repos(self) -> bool:
+        """Add the owner's repos for `all_repos`; return True if any were new.
+
+        They are then polled like a list. A failed listing leaves `all_repos`
+        set, so it is retried on the next poll.
+        """
+        owned = await self.client.list_repos(self.username)
+        if owned is None:
+            return False
+        self.all_repos = False
+        new = [r for r in owned if r not in self.repos]
+        self.repos.extend(new)
+        return bool(new)
+
+    async def run(self) -> None:
+        if self.all_repos:
+            await self.resolve_repos()
+        # The local history is ready before the first poll reports on it
+        await asyncio.to_thread(self.tux.refresh_commit_index)
+        index_changed = True
+        while True:
+            if await self.poll(index_changed):
+                index_changed = False
+            delay = self.next_delay()
+            log("Next GitHub poll in", round(delay), "s")
+            await asyncio.sleep(delay)
+
+    async def poll(self, index_changed=False) -> bool:
+        """Poll once and report it to `on_poll`; return False if it failed."""
+        try:
+            with REGISTRY.time("tux_poll_seconds"):
+                result = await self._poll()
+        except Exception as e:
+            log("GitHub poll failed:", e)
+            self.scheduler.record_poll("failed")
+            return False
+        if result is None:
+            # Keep the last poll time and the saved snapshot from a real poll
+            log("GitHub poll failed: no repo could be fetched")
+            self.scheduler.record_poll("failed")
+            return False
+        new_commit, changed = result
+        self.last_poll = datetime.now(timezone.utc).isoformat()
+        if self.on_poll is not None:
+            await self.on_poll(new_commit, index_changed or changed)
+        return True
+
+    async def _poll(self):
+        """Poll once; return (whether the newest commit moved, index changed).
+
+        Returns None if no repo's commit time could be fetched.
+        """
+        reloaded = False
+        if self.all_repos and await self.resolve_repos():
+            # The new repos may already have history in the store
+            await asyncio.to_thread(self.tux.refresh_commit_index)
+            reloaded = True
+        if self.backend == "graphql":
+            since = datetime.now(timezone.utc) - timedelta(days=1)
+            activity = await self.client.get_repo_activity(self.repos, since)
+            commit_times = {repo: t for repo, (t, _) in activity.items()}
+            self.tux.repo_recent_commits.update(
+                {repo: n for repo, (_, n) in activity.items() if n is not None}
+            )
+        else:
+            commit_times = await self.client.get_commit_times(self.repos)
+        failed = sum(t is None for t in commit_times.values())
+        if failed == len(commit_times):
+            return None
+        self.scheduler.record_poll("partial" if failed else "ok")
+        self.tux.update_repo_status(commit_times)
+        index_changed = await self.sync_history(commit_times) > 0 or reloaded
+        log("GitHub cache stats:", get_cache_stats())
+
+        commit_time = self.tux.last_commit_time
+        if commit_time and commit_time != self._last_commit_time:
+            self._last_commit_time = commit_time
+            log("[✓] Fetched new commit time:", commit_time)
+            return True, index_changed
+        return False, index_changed
+
+    async def sync_history(self, commit_times) -> int:
+        """Pull new commits into the store for repos whose head moved.
+
+        A sync that hits the page cap leaves a gap behind the newest commits.
+        Gaps are stored and filled one per repo per poll, taking turns.
+        """
+        store = self.store
+        window_start = datetime.now(timezone.utc) - timedelta(days=self.history_days)
+
+        async def store_commits(repo, commits):
+            added = await asyncio.to_thread(store.add_commits, repo, commits)
+            log("Stored", len(added), "new commits for", repo)
+            return added
+
+        async def sync(repo, head_time):
+            start = store.sync_start(repo)
+            if start is None or window_start < start:
+                await asyncio.to_thread(store.set_sync_start, repo, window_start)
+                if start is not None:
+                    # history_days grew: the older part of the window is a gap
+                    await asyncio.to_thread(store.set_gap, repo, window_start, start)
+
+            added = []
+            newest = store.newest_commit_time(repo)
+            if newest is None or head_time > newest:
+                # First sync only backfills a bounded window of history
+                since = newest or window_start
+                commits, complete = await self.client.get_commits_since(
+                    repo, since, max_pages=SYNC_PAGES
+                )
+                if commits:
+                    if not complete:
+                        oldest = min(map(parse_commit_time, commits))
+                        await asyncio.to_thread(store.set_gap, repo, since, oldest)
+                    added += await store_commits(repo, commits)
+
+            gaps = store.gaps(repo)
+            if gaps:
+                # Gaps take turns, so one that never completes can't starve the rest
+                turn = self._gap_turn.get(repo, 0)
+                since, until, page = gaps[turn % len(gaps)]
+                commits, complete = await self.client.get_commits_since(
+                    repo, since, until, max_pages=SYNC_PAGES, page=page
+                )
+                if complete:
+                    await asyncio.to_thread(store.remove_gap, repo, since)
+                else:
+                    self._gap_turn[repo] = turn + 1
+                    oldest = min(map(parse_commit_time, commits), default=until)
+                    if oldest < until:
+                        # Resume below the oldest commit fetched this time
+                        await asyncio.to_thread(store.set_gap, repo, since, oldest)
+                    elif commits:
+                        # Every commit fetched shares the `until` second, so
+                        # narrowing the range can't get past them; page on instead
+                        await asyncio.to_thread(
+                            store.set_gap, repo, since, until, page + SYNC_PAGES
+                        )
+                if commits:
+                    added += await store_commits(repo, commits)
+            return added
+
+        synced = await asyncio.gather(
+            *(sync(repo, t) for repo, t in commit_times.items() if t is not None)
+        )
+        # Only the new times go into the index; reloading it is O(history)
+        added = [t for times in synced for t in times]
+        self.tux.commit_index.add(added)
+        return len(added)
+
+    async def close(self) -> None:
+        # Any in-flight poll is cancelled with its task; just drop the pool
+        await self.client.close()
+        self.store.close()
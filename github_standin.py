@@ -0,0 +1,403 @@
+"""Local stand-in for the parts of the GitHub API that Tuxagotchi uses.
+
+Serves repo commits (with ETags, `since` and Link pagination), owner repo
+listings and the GraphQL activity query, for synthetic repos, for histories
+recorded from the real API, or for both. Rate-limit headers, latency and
+failures are configurable, so polling can be load-tested offline:
+
+    python3 -m github_standin record fixture.json owner/repo ... --token TOKEN
+    python3 -m github_standin serve --replay fixture.json --latency 0.05
+    python3 -m github_standin serve --repos 5000 --error-rate 0.01
+
+`serve` prints its base URL on the first line; point `[github] api_url` at
+it. GET /_standin/stats returns request counts by status.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+COMMITS_PER_REPO = 200
+
+
+def _date(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _sha(*parts):
+    return hashlib.sha1("/".join(map(str, parts)).encode()).hexdigest()
+
+
+def _commit(sha, when):
+    return {
+        "sha": sha,
+        "commit": {"author": {"date": _date(when)}, "committer": {"date": _date(when)}},
+    }
+
+
+class RateLimiter:
+    """GitHub-style primary rate limit: `limit` requests per fixed window.
+
+    Each token (or anonymous client) has its own budget. Like GitHub, 304
+    responses are free.
+    """
+
+    def __init__(self, limit=5000, window=3600):
+        self.limit = limit
+        self.window = window
+        self._used = {}
+
+    def _bucket(self, key):
+        now = time.time()
+        reset, used = self._used.get(key, (0, 0))
+        if reset <= now:
+            reset, used = now + self.window, 0
+            self._used[key] = (reset, used)
+        return reset, used
+
+    def exhausted(self, key):
+        return self._bucket(key)[1] >= self.limit
+
+    def charge(self, key):
+        reset, used = self._bucket(key)
+        self._used[key] = (reset, used + 1)
+
+    def headers(self, key):
+        reset, used = self._bucket(key)
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.limit - used, 0)),
+            "X-RateLimit-Reset": str(int(reset)),
+            "X-RateLimit-Used": str(used),
+        }
+
+
+class GitHubStandIn:
+    """The stand-in server's state: repo histories, rate limits and faults.
+
+    `repo_count` synthetic repos named "owner/repo-N" are generated lazily,
+    so thousands cost nothing until polled. `recorded` maps "owner/name" to a
+    newest-first commit list, as written by `record`. With `push_interval`, a
+    random repo gets a new commit that often.
+    """
+
+    def __init__(
+        self,
+        owner="bench",
+        repo_count=50,
+        recorded=None,
+        commits_per_repo=COMMITS_PER_REPO,
+        rate_limit=5000,
+        rate_window=3600,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        retry_after=60,
+        poll_interval=None,
+        push_interval=None,
+        seed=None,
+        now=None,
+    ):
+        self.owner = owner
+        self.now = now or datetime.now(timezone.utc)
+        self.commits_per_repo = commits_per_repo
+        self.recorded = dict(recorded or {})
+        self.repos = list(self.recorded)
+        self.repos.extend(
+            f"{owner}/repo-{i}"
+            for i in range(repo_count)
+            if f"{owner}/repo-{i}" not in self.recorded
+        )
+        self._known = set(self.repos)
+        self.limiter = RateLimiter(rate_limit, rate_window)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.poll_interval = poll_interval
+        self.push_interval = push_interval
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self._commits = {}
+        # Encoded response bodies per repo, dropped when the repo changes
+        self._pages = {}
+        self._push_task = None
+
+    def commits(self, full_name):
+        """Newest-first history: recorded, or one commit every few hours."""
+        if full_name not in self._commits:
+            if full_name in self.recorded:
+                self._commits[full_name] = list(self.recorded[full_name])
+            else:
+                seed = int(_sha(full_name), 16)
+                head = self.now - timedelta(minutes=seed % 600)
+                self._commits[full_name] = [
+                    _commit(_sha(full_name, i), head - timedelta(hours=3 * i))
+                    for i in range(self.commits_per_repo)
+                ]
+        return self._commits[full_name]
+
+    def push(self, full_name, when=None):
+        """Add a new head commit to a repo, as if someone pushed."""
+        commits = self.commits(full_name)
+        commits.insert(
+            0,
+            _commit(
+                _sha(full_name, "push", len(commits)),
+                when or datetime.now(timezone.utc),
+            ),
+        )
+        self._pages.pop(full_name, None)
+
+    async def _push_loop(self):
+        while True:
+            await asyncio.sleep(self.push_interval)
+            self.push(self.random.choice(self.repos))
+
+    @web.middleware
+    async def faults(self, request, handler):
+        """Apply latency, injected failures and the rate limit to API calls."""
+        if request.path.startswith("/_standin/"):
+            return await handler(request)
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        key = request.headers.get("Authorization") or request.remote
+        roll = self.random.random()
+        if self.limiter.exhausted(key):
+            response = web.json_response(
+                {"message": "API rate limit exceeded"}, status=403
+            )
+        elif roll < self.error_rate:
+            response = web.json_response({"message": "Server Error"}, status=502)
+        elif roll < self.error_rate + self.throttle_rate:
+            # A secondary rate limit: no quota used, but the client must wait
+            response = web.json_response(
+                {"message": "You have exceeded a secondary rate limit"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        else:
+            response = await handler(request)
+            if response.status != 304:
+                self.limiter.charge(key)
+        response.headers.update(self.limiter.headers(key))
+        if self.poll_interval is not None:
+            response.headers["X-Poll-Interval"] = str(self.poll_interval)
+        self.stats[response.status] += 1
+        return response
+
+    def _json(self, request, body, etag, headers=None):
+        headers = {**(headers or {}), "ETag": etag}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, headers=headers, content_type="application/json")
+
+    def _page(self, request, items, cache=None):
+        """Serve one page of `items`, reusing the encoded body from `cache`."""
+        per_page = min(int(request.query.get("per_page", 30)), 100)
+        page = int(request.query.get("page", 1))
+        headers = {}
+        if page * per_page < len(items):
+            url = request.url.update_query(page=page + 1)
+            headers["Link"] = f'<{url}>; rel="next"'
+        key = request.query_string
+        if cache is None or key not in cache:
+            body = json.dumps(items[(page - 1) * per_page : page * per_page]).encode()
+            entry = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            if cache is None:
+                return self._json(request, *entry, headers)
+            cache[key] = entry
+        return self._json(request, *cache[key], headers)
+
+    async def repo_commits(self, request):
+        full_name = f"{request.match_info['owner']}/{request.match_info['name']}"
+        if full_name not in self._known:
+            return web.json_response({"message": "Not Found"}, status=404)
+        commits = self.commits(full_name)
+        if "since" in request.query:
+            since = request.query["since"]
+            commits = [c for c in commits if c["commit"]["committer"]["date"] >= since]
+        if "until" in request.query:
+            until = request.query["until"]
+            commits = [c for c in commits if c["commit"]["committer"]["date"] <= until]
+        return self._page(request, commits, self._pages.setdefault(full_name, {}))
+
+    async def user_repos(self, request):
+        owner = request.match_info["owner"]
+        repos = [
+            {"full_name": name} for name in self.repos if name.split("/")[0] == owner
+        ]
+        return self._page(request, repos)
+
+    async def graphql(self, request):
+        payload = await request.json()
+        variables = payload["variables"]
+        since = variables["since"]
+        data = {}
+        for key in variables:
+            match = re.fullmatch(r"o(\d+)", key)
+            if not match:
+                continue
+            i = match[1]
+            full_name = f"{variables[key]}/{variables[f'n{i}']}"
+            if full_name not in self._known:
+                data[f"r{i}"] = None
+                continue
+            dates = [c["commit"]["committer"]["date"] for c in self.commits(full_name)]
+            data[f"r{i}"] = {
+                "defaultBranchRef": {
+                    "target": {
+                        "committedDate": dates[0],
+                        "history": {"totalCount": sum(d >= since for d in dates)},
+                    }
+                }
+            }
+        return web.json_response({"data": data})
+
+    async def stats_handler(self, request):
+        return web.json_response({str(k): v for k, v in sorted(self.stats.items())})
+
+    def make_app(self):
+        app = web.Application(middlewares=[self.faults])
+        app.router.add_get("/repos/{owner}/{name}/commits", self.repo_commits)
+        app.router.add_get("/users/{owner}/repos", self.user_repos)
+        app.router.add_get("/orgs/{owner}/repos", self.user_repos)
+        app.router.add_post("/graphql", self.graphql)
+        app.router.add_get("/_standin/stats", self.stats_handler)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Serve in the running loop; returns the runner and the base URL."""
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        if self.push_interval:
+            self._push_task = asyncio.create_task(self._push_loop())
+        port = runner.addresses[0][1]
+        return runner, f"http://{host}:{port}"
+
+
+async def record(path, repos, token=None, api_url=None, max_pages=10):
+    """Save the commit histories of `repos` from the real API to `path`."""
+    from github_async import API_URL, GitHubClient
+
+    client = GitHubClient(token=token, api_url=api_url or API_URL)
+    try:
+        histories = await asyncio.gather(
+            *(client.get_commits_since(repo, max_pages=max_pages) for repo in repos)
+        )
+        histories = [commits for commits, _ in histories]
+    finally:
+        await client.close()
+    recorded = {}
+    for repo, commits in zip(repos, histories):
+        if not commits:
+            print("No commits recorded for", repo)
+            continue
+        # Only the fields the app reads, which keeps fixtures small
+        recorded[repo] = [
+            {
+                "sha": c["sha"],
+                "commit": {
+                    "author": {"date": c["commit"]["author"]["date"]},
+                    "committer": {"date": c["commit"]["committer"]["date"]},
+                },
+            }
+            for c in commits
+        ]
+    with open(path, "w") as f:
+        json.dump({"commits": recorded}, f)
+    print("Recorded", sum(map(len, recorded.values())), "commits to", path)
+
+
+async def serve(standin, port):
+    runner, url = await standin.start(port=port)
+    # Callers such as the benchmarks read the URL from the first line
+    print(url, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="save real histories to a fixture")
+    rec.add_argument("path")
+    rec.add_argument("repos", nargs="+", help='"owner/name"')
+    rec.add_argument("--token")
+    rec.add_argument("--api-url")
+    rec.add_argument("--max-pages", type=int, default=10, help="100 commits each")
+
+    srv = commands.add_parser("serve", help="run the stand-in server")
+    srv.add_argument("--port", type=int, default=0)
+    srv.add_argument("--replay", help="fixture written by `record`")
+    srv.add_argument("--owner", default="bench")
+    srv.add_argument(
+        "--repos", type=int, help="synthetic repos (default 50, or 0 with --replay)"
+    )
+    srv.add_argument("--commits", type=int, default=COMMITS_PER_REPO)
+    srv.add_argument("--rate-limit", type=int, default=5000)
+    srv.add_argument("--rate-window", type=int, default=3600, help="seconds")
+    srv.add_argument("--latency", type=float, default=0.0, help="seconds")
+    srv.add_argument("--jitter", type=float, default=0.0, help="extra random latency")
+    srv.add_argument("--error-rate", type=float, default=0.0, help="share of 502s")
+    srv.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429s")
+    srv.add_argument("--retry-after", type=int, default=60)
+    srv.add_argument("--poll-interval", type=int, help="send X-Poll-Interval")
+    srv.add_argument("--push-interval", type=float, help="seconds between pushes")
+    srv.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(
+            record(args.path, args.repos, args.token, args.api_url, args.max_pages)
+        )
+        return
+
+    recorded = None
+    if args.replay:
+        with open(args.replay) as f:
+            recorded = json.load(f)["commits"]
+    repo_count = args.repos if args.repos is not None else (0 if recorded else 50)
+    standin = GitHubStandIn(
+        owner=args.owner,
+        repo_count=repo_count,
+        recorded=recorded,
+        commits_per_repo=args.commits,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        poll_interval=args.poll_interval,
+        push_interval=args.push_interval,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(serve(standin, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
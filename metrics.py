@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Recent samples kept per summary for the percentiles in the overlay
+SUMMARY_WINDOW = 512
+
+HELP = {
+    "tux_poll_seconds": "Duration of a full GitHub poll",
+    "tux_http_responses_total": "GitHub API responses by status",
+    "tux_rate_limit_remaining": "Requests left in the current rate-limit window",
+    "tux_cava_fps": "Visualizer frames painted in the last second",
+    "tux_cava_frames_painted_total": "Visualizer frames painted",
+    "tux_cava_frames_dropped_total": "Visualizer frames read but never painted",
+    "tux_render_seconds": "Time spent rendering a widget",
+    "tux_todo_op_seconds": "Time to apply and journal a TODO edit",
+}
+
+
+class Summary:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=SUMMARY_WINDOW)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Metrics:
+    """In-process registry of counters, gauges and summaries.
+
+    Metrics are keyed by name plus keyword labels and created on first use.
+    Recording is a dict lookup and an add, so it is cheap enough for the
+    render paths.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.summaries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = Summary()
+            summary.observe(value)
+
+    @contextmanager
+    def time(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def prometheus_text(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            groups = [
+                ("counter", self.counters),
+                ("gauge", self.gauges),
+                ("summary", self.summaries),
+            ]
+            seen = set()
+            for kind, metrics in groups:
+                for (name, labels), value in sorted(metrics.items()):
+                    if name not in seen:
+                        seen.add(name)
+                        if name in HELP:
+                            lines.append(f"# HELP {name} {HELP[name]}")
+                        lines.append(f"# TYPE {name} {kind}")
+                    if kind != "summary":
+                        lines.append(f"{name}{_labels(labels)} {value}")
+                        continue
+                    for q in (0.5, 0.95, 0.99):
+                        quantile = _labels(labels + (("quantile", str(q)),))
+                        lines.append(f"{name}{quantile} {value.quantile(q)}")
+                    lines.append(f"{name}_sum{_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def write_textfile(registry, path):
+    """Write the metrics for node_exporter's textfile collector, atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(registry.prometheus_text())
+    os.replace(tmp_path, path)
+
+
+async def serve_http(registry, port, host="127.0.0.1"):
+    """Serve the metrics at http://host:port/metrics; returns the runner."""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=registry.prometheus_text(), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+# Shared by the whole app
+REGISTRY = Metrics()
@@ -0,0 +1,132 @@
+import random
+import time
+from datetime import timedelta
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# How long after the last commit Tux turns sad (see MOOD_LIMITS in tux.py)
+SAD_AFTER = timedelta(days=1)
+
+
+class TokenPool:
+    """Rotates across GitHub tokens, preferring the one with most quota left."""
+
+    def __init__(self, tokens):
+        self.tokens = [t for t in tokens if t] or [None]
+        self.remaining = {t: None for t in self.tokens}
+        self.reset_at = {t: 0.0 for t in self.tokens}
+
+    def pick(self):
+        now = time.time()
+
+        def quota(token):
+            remaining = self.remaining[token]
+            if remaining is None or self.reset_at[token] <= now:
+                # Unknown or already reset: assume a full budget
+                return float("inf")
+            return remaining
+
+        return max(self.tokens, key=quota)
+
+    def observe(self, token, headers):
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        reset_at = _header_int(headers, "X-RateLimit-Reset")
+        if token in self.remaining and remaining is not None:
+            self.remaining[token] = remaining
+            self.reset_at[token] = reset_at or 0.0
+
+    def budget(self):
+        """Return (requests left, seconds until the earliest reset) for all tokens."""
+        now = time.time()
+        if any(r is None for r in self.remaining.values()):
+            return None, None
+        remaining = sum(self.remaining.values())
+        reset_in = min(max(r - now, 0.0) for r in self.reset_at.values())
+        return remaining, reset_in
+
+
+class PollScheduler:
+    """Decides how long to wait before the next GitHub poll.
+
+    Feed every response to `observe` and every poll's outcome to
+    `record_poll`; `next_delay` then combines the rate-limit budget, server
+    hints (Retry-After, X-Poll-Interval), error backoff and how close Tux is
+    to a mood change.
+    """
+
+    def __init__(self, token_pool, min_interval=10, base_interval=60, max_interval=600):
+        self.token_pool = token_pool
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.failures = 0
+        self.poll_interval_hint = 0
+        self.hold_until = 0.0
+
+    def observe(self, status, headers, token=None):
+        """Record the rate-limit and pacing headers of one response.
+
+        Backoff is driven by whole polls, see `record_poll`.
+        """
+        headers = headers or {}
+        self.token_pool.observe(token, headers)
+
+        poll_interval = _header_int(headers, "X-Poll-Interval")
+        if poll_interval is not None:
+            self.poll_interval_hint = poll_interval
+
+        retry_after = _header_int(headers, "Retry-After")
+        if retry_after is not None:
+            self.hold_until = max(self.hold_until, time.time() + retry_after)
+
+    def record_poll(self, outcome):
+        """Record how a whole poll went: "ok", "partial" or "failed".
+
+        A failed poll backs off further and an ok one resets the backoff. A
+        partial one keeps it as is, so one repo that keeps failing neither
+        stalls polling nor hides an outage of the rest.
+        """
+        if outcome == "failed":
+            self.failures += 1
+        elif outcome == "ok":
+            self.failures = 0
+
+    def activity_interval(self, since_commit, until_next_mood):
+        if since_commit is None:
+            return self.base_interval
+        if since_commit < timedelta(hours=1):
+            return self.min_interval
+        if until_next_mood is not None and until_next_mood < timedelta(minutes=30):
+            # A commit now would keep Tux from dropping a mood
+            return self.min_interval
+        if until_next_mood is None or since_commit >= SAD_AFTER:
+            # Sad or dead: nothing urgent to catch until the next drop nears
+            return self.max_interval
+        return self.base_interval
+
+    def next_delay(self, since_commit=None, until_next_mood=None, cost=1):
+        """Return seconds until the next poll, which will make `cost` requests."""
+        delay = self.activity_interval(since_commit, until_next_mood)
+
+        if self.failures:
+            exponent = min(self.failures - 1, 10)
+            backoff = min(self.base_interval * 2**exponent, self.max_interval)
+            # Full jitter keeps several instances from retrying in lockstep
+            delay = max(delay, random.uniform(backoff / 2, backoff))
+
+        remaining, reset_in = self.token_pool.budget()
+        if remaining is not None:
+            if remaining < cost:
+                delay = max(delay, reset_in + random.uniform(1, 5))
+            else:
+                # Spread what's left of the budget evenly until the reset
+                delay = max(delay, reset_in / (remaining / cost))
+
+        delay = max(delay, self.poll_interval_hint, self.hold_until - time.time())
+        return max(delay, self.min_interval)
@@ -0,0 +1,28 @@
+import json
+import os
+from config import get_config_dir
+
+SNAPSHOT_PATH = get_config_dir() / "snapshot.json"
+# Bumped when the layout changes; older snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Return the saved snapshot, or None if missing, unreadable or outdated."""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    snapshot = {"version": SNAPSHOT_VERSION, **snapshot}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
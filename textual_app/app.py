@@ -1,45 +1,85 @@
-from datetime import datetime, timezone, timedelta
+import sys
+from textual_app import profiling
+
+# Must run before the other imports so their cost is recorded
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    profiling.start()
+
 import asyncio
-import os
-from pathlib import Path
-from github_api import get_recent_commit_time
 from textual.app import App
-from textual.containers import Horizontal, Vertical
+from textual.containers import Horizontal
 from textual import log
 from textual_app.cava_widget import CavaWidget
+from textual_app.spectrum import make_backend
+from textual_app.daemon_client import DaemonBackend, connect_daemon
 from textual_app.tux import Tux
 from textual_app.tux_widget import TuxWidget
 from textual_app.todo_widget import TodoWidget
-from config import load_config
+from textual_app.metrics_overlay import MetricsOverlay
+from textual_app.heatmap import HeatmapOverlay
+from metrics import REGISTRY
+from config import load_config, get_repos
+from snapshot import load_snapshot, save_snapshot
 from textual_app.ui_helpers import generate_css
 from textual_app.ascii_loader import preload_ascii_frames
 from textual.widgets import Static
 from textual_app.ui_helpers import get_css_path
 
+profiling.mark("imports")
+
 
 class TuxApp(App):
     """Main Tuxagotchi Textual App"""
 
-    BINDINGS = [("q", "quit", "Quit")]
+    BINDINGS = [
+        ("q", "quit", "Quit"),
+        ("m", "toggle_metrics", "Metrics"),
+        ("h", "toggle_heatmap", "Heatmap"),
+    ]
     CSS_PATH = get_css_path()
 
+    def __init__(self, profile_startup: bool = False):
+        super().__init__()
+        # Exit right after the first paint, for measuring startup
+        self.profile_startup = profile_startup
+        self.tux = None
+        self.poller = None
+        self.daemon = None
+        self.metrics_server = None
+
     async def on_mount(self) -> None:
         # Preload ascii for better proformance
         preload_ascii_frames()
+        profiling.mark("assets")
         # Load user config including colors
         config = load_config()
+        profiling.mark("config")
+        self.config = config
         self.username = config["github"]["username"]
-        self.repo = config["github"]["repo"]
         self.token = config["github"]["token"]
+        self.repos = get_repos(config)
         self.theme_colors = config["colors"]
 
-        # GitHub commit tracking
-        self.last_valid_commit_time = None
-        self.last_checked = datetime.min.replace(tzinfo=timezone.utc)
+        # GitHub polling is set up after the first paint
+        self.last_poll = None
 
         # Initialize Tux logic and UI
-        self.tux = Tux(username=self.username, repo=self.repo)
-        self.tux_widget = TuxWidget(self.tux, self.repo)
+        self.tux = Tux(
+            username=self.username,
+            repo=config["github"].get("repo"),
+            repos=self.repos,
+        )
+        self.repo = self.tux.repo
+        # Show the last known state on the first frame; the network catches up
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            self.tux.restore_snapshot(snapshot)
+            self.last_poll = snapshot.get("last_poll")
+        profiling.mark("snapshot")
+        # A running tuxd polls GitHub and runs cava once for every app
+        self.daemon = await connect_daemon(config["daemon"]["socket"])
+        profiling.mark("daemon")
+        self.tux_widget = TuxWidget(self.tux, self.repo or "Unknown")
         self._style_tux_widget()
 
         # For screenshots
@@ -48,7 +88,18 @@ class TuxApp(App):
         self.todo_widget = TodoWidget(id="todo-widget")
         self._style_todo_widget()
 
-        self.cava_widget = CavaWidget(id="cava-widget")
+        self.cava_widget = CavaWidget(
+            id="cava-widget",
+            backend=(
+                DaemonBackend(self.daemon)
+                if self.daemon is not None
+                else make_backend(config["cava"])
+            ),
+            fps=config["cava"]["fps"],
+            silence_seconds=config["idle"]["silence_seconds"],
+            unfocused_fps=config["idle"]["unfocused_fps"],
+            stop_unfocused=config["idle"]["stop_cava"],
+        )
         self._style_cava_widget()
 
         top_row = Horizontal(self.tux_widget, self.todo_widget, id="main-container")
@@ -57,7 +108,7 @@ class TuxApp(App):
 
         # Keybinds bar
         self.keybinds = Static(
-            "[bold][/bold]【q ➡ Quit】【a ➡ Insert】【x ➡ Delete】【j/k ➡ Up/Down】【esc ➡ Navigate】",
+            "[bold][/bold]【q ➡ Quit】【a ➡ Insert】【x ➡ Delete】【j/k ➡ Up/Down】【J/K ➡ Move】【/ ➡ Search】【m ➡ Metrics】【h ➡ Heatmap】【esc ➡ Navigate】",
             id="keybinds",
         )
         self.keybinds.styles.dock = "bottom"
@@ -67,9 +118,100 @@ class TuxApp(App):
         self.keybinds.styles.padding = (0, 1)
         await self.mount(self.keybinds)
 
-        # Reduced check interval from 60
-        # Token implementation now increases rate limit to 5k/hr
-        self.set_interval(30, self.check_github)
+        self.metrics_overlay = MetricsOverlay(id="metrics-overlay")
+        await self.mount(self.metrics_overlay)
+        self.heatmap_overlay = HeatmapOverlay(self.tux, id="heatmap-overlay")
+        await self.mount(self.heatmap_overlay)
+
+        self.call_after_refresh(self.after_first_paint)
+
+    def after_first_paint(self) -> None:
+        profiling.mark("first paint")
+        if self.profile_startup:
+            self.exit()
+            return
+        if self.daemon is not None:
+            self.run_worker(self.follow_daemon())
+        else:
+            self.start_github()
+        # Metrics cover this app's rendering whether or not a daemon polls
+        self.start_metrics_export()
+
+    def start_github(self) -> None:
+        """Poll GitHub from this app, for when no daemon is running."""
+        # Deferred import: aiohttp and sqlite are off the first-paint path
+        from github_poller import GitHubPoller
+
+        self.poller = GitHubPoller(self.config, self.tux, on_poll=self.on_poll)
+        # Polls right away, then at a pace set by rate limits and activity
+        self.run_worker(self.poller.run(), exit_on_error=False)
+
+    async def follow_daemon(self) -> None:
+        from commit_store import CommitStore
+
+        # The daemon fills the shared store; read it for the heatmap
+        self.tux.store = CommitStore()
+        await self.daemon.run(self.on_daemon_state)
+        log("Lost the daemon, running standalone")
+        await self.daemon.close()
+        self.daemon = None
+        self.tux.store.close()
+        await self.cava_widget.set_backend(make_backend(self.config["cava"]))
+        self.start_github()
+
+    def on_daemon_state(self, state) -> None:
+        # Repos the daemon resolved through `all_repos`
+        self.repos.extend(r for r in state["repos"] if r not in self.repos)
+        self.tux.restore_snapshot(state)
+        self.last_poll = state.get("last_poll")
+        self.tux_widget.check_mood()
+        if state["history"] != len(self.tux.commit_index):
+            self.run_worker(self.refresh_commit_index())
+
+    def start_metrics_export(self) -> None:
+        metrics = self.config["metrics"]
+        if metrics["textfile"]:
+            self.set_interval(metrics["interval"], self.write_metrics_textfile)
+        if metrics["port"]:
+            self.run_worker(self.serve_metrics(metrics["port"]), exclusive=False)
+
+    async def write_metrics_textfile(self) -> None:
+        from metrics import write_textfile
+
+        try:
+            await asyncio.to_thread(
+                write_textfile, REGISTRY, self.config["metrics"]["textfile"]
+            )
+        except OSError as e:
+            log("Failed to write metrics textfile:", e)
+
+    async def serve_metrics(self, port) -> None:
+        from metrics import serve_http
+
+        try:
+            self.metrics_server = await serve_http(REGISTRY, port)
+        except OSError as e:
+            log("Failed to serve metrics on port", port, e)
+
+    def on_app_blur(self) -> None:
+        # The terminal lost focus: stop animating and slow the visualizer
+        self.tux_widget.set_animated(False)
+        self.cava_widget.set_unfocused(True)
+
+    def on_app_focus(self) -> None:
+        self.tux_widget.set_animated(True)
+        self.cava_widget.set_unfocused(False)
+
+    def action_toggle_metrics(self) -> None:
+        self.metrics_overlay.toggle()
+
+    def action_toggle_heatmap(self) -> None:
+        self.heatmap_overlay.toggle()
+
+    async def refresh_commit_index(self) -> None:
+        await asyncio.to_thread(self.tux.refresh_commit_index)
+        if self.heatmap_overlay.display:
+            self.heatmap_overlay.update_heatmap()
 
     def _style_tux_widget(self) -> None:
         self.tux_widget.styles.flex = 1
@@ -94,29 +236,45 @@ class TuxApp(App):
         self.cava_widget.styles.padding = (0, 0)
         self.cava_widget.styles.dock = "top"
 
-    async def check_github(self) -> None:
-        now = datetime.now(timezone.utc)
-        if now - self.last_checked < timedelta(seconds=60):
-            return
-        self.last_checked = now
-        commit_time = await asyncio.to_thread(
-            get_recent_commit_time, self.username, self.repo, self.token
-        )
-        if commit_time and commit_time != self.last_valid_commit_time:
-            self.last_valid_commit_time = commit_time
-            self.tux.last_commit_time = commit_time
-            self.tux.update_mood(commit_time)
-            self.tux_widget.refresh()
-            log(f"[✓] Fetched new commit time: {commit_time}")
+    async def on_poll(self, new_commit, index_changed) -> None:
+        if new_commit:
+            self.tux_widget.check_mood()
+        if index_changed and self.heatmap_overlay.display:
+            self.heatmap_overlay.update_heatmap()
+        self.last_poll = self.poller.last_poll
+        try:
+            await asyncio.to_thread(save_snapshot, self.snapshot())
+        except OSError as e:
+            log("Failed to save snapshot:", e)
+
+    def snapshot(self) -> dict:
+        return {**self.tux.to_snapshot(), "last_poll": self.last_poll}
+
+    def on_tux_widget_mood_changed(self, event: TuxWidget.MoodChanged) -> None:
+        log("Mood changed from", event.previous, "to", event.mood)
+
+    async def on_unmount(self) -> None:
+        if self.daemon is not None:
+            # The daemon keeps the snapshot and the store up to date
+            await self.daemon.close()
+            # Only opened once following the daemon, after the first paint
+            if self.tux.store is not None:
+                self.tux.store.close()
+        elif self.tux is not None:
+            # Skipped when on_mount failed before Tux was set up
+            try:
+                save_snapshot(self.snapshot())
+            except OSError as e:
+                log("Failed to save snapshot:", e)
+        if self.poller is not None:
+            await self.poller.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.cleanup()
 
 
 def generate_css_file():
-    # Use XDG_CONFIG_HOME or default to ~/.config/tuxagotchi
-    config_dir = (
-        Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "tuxagotchi"
-    )
-    config_dir.mkdir(parents=True, exist_ok=True)
-    css_path = config_dir / "styles.css"
+    css_path = get_css_path()
+    css_path.parent.mkdir(parents=True, exist_ok=True)
 
     if not css_path.exists():
         config = load_config()
@@ -128,5 +286,7 @@ def generate_css_file():
 
 if __name__ == "__main__":
     generate_css_file()
-    app = TuxApp()
+    app = TuxApp(profile_startup=profiling.enabled)
     app.run()
+    if profiling.enabled:
+        profiling.report()
@@ -1,15 +1,82 @@
+import json
+import os
+import re
 from pathlib import Path
+from config import get_config_dir
 
+# Shipped next to the textual_app package, not relative to the cwd
+ASSET_DIR = Path(__file__).resolve().parent.parent / "assets"
+ATLAS_CACHE_PATH = get_config_dir() / "atlas.json"
+
+# Frames are stored centered to this width so rendering never re-centers them
+FRAME_WIDTH = 32
+
+FRAME_PATTERN = re.compile(r"^(?P<mood>[a-z]+)_(?P<index>\d+)\.txt$")
+
+# mood -> list of pre-centered frames, in animation order
 ASCII_FRAMES = {}
 
 
-def preload_ascii_frames(asset_dir="assets"):
-    moods = ["happy", "neutral", "sad"]
-    for mood in moods:
-        ASCII_FRAMES[mood] = []
-        for i in range(2):
-            path = Path(asset_dir) / f"{mood}_{i + 1}.txt"
-            if path.exists():
-                ASCII_FRAMES[mood].append(path.read_text())
-            else:
-                ASCII_FRAMES[mood].append(f"[Missing {mood}_{i + 1}]")
+def scan_assets(asset_dir):
+    """Return {file name: mtime_ns} for every `<mood>_<n>.txt` frame file."""
+    try:
+        entries = os.scandir(asset_dir)
+    except FileNotFoundError:
+        return {}
+    with entries:
+        return {
+            entry.name: entry.stat().st_mtime_ns
+            for entry in entries
+            if FRAME_PATTERN.match(entry.name)
+        }
+
+
+def compile_atlas(asset_dir, names):
+    """Read and center every frame file, grouped by mood and ordered by index."""
+    found = {}
+    for name in names:
+        match = FRAME_PATTERN.match(name)
+        found.setdefault(match["mood"], []).append((int(match["index"]), name))
+
+    atlas = {}
+    for mood, frames in found.items():
+        atlas[mood] = []
+        for _, name in sorted(frames):
+            lines = (Path(asset_dir) / name).read_text().splitlines()
+            atlas[mood].append("\n".join(line.center(FRAME_WIDTH) for line in lines))
+    return atlas
+
+
+def load_atlas(asset_dir=ASSET_DIR):
+    """Return the frame atlas, reusing the on-disk cache while no file changed."""
+    files = scan_assets(asset_dir)
+    stamp = {"asset_dir": str(asset_dir), "width": FRAME_WIDTH, "files": files}
+
+    try:
+        with open(ATLAS_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached["stamp"] == stamp:
+            return cached["frames"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    atlas = compile_atlas(asset_dir, files)
+    try:
+        ATLAS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ATLAS_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"stamp": stamp, "frames": atlas}, f)
+        os.replace(tmp_path, ATLAS_CACHE_PATH)
+    except OSError:
+        pass
+    return atlas
+
+
+def preload_ascii_frames(asset_dir=ASSET_DIR):
+    ASCII_FRAMES.clear()
+    ASCII_FRAMES.update(load_atlas(asset_dir))
+    return ASCII_FRAMES
+
+
+def get_frames(mood):
+    return ASCII_FRAMES.get(mood) or [f"[Missing {mood}]"]
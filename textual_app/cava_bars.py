@@ -0,0 +1,105 @@
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Region
+from textual.strip import Strip
+from textual.widget import Widget
+
+# Eighths of a cell, from empty to full
+BLOCKS = " ▁▂▃▄▅▆▇█"
+
+
+def build_row_table(row: int, rows: int) -> dict:
+    """Return a str.translate table mapping 8-bit samples to the glyph for a row.
+
+    Row 0 is the top row; a full-scale sample fills all `rows` rows. The bottom
+    row never goes blank so silence still shows a baseline.
+    """
+    total = rows * 8
+    base = (rows - 1 - row) * 8
+    table = {}
+    for sample in range(256):
+        fill = min(max(sample * (total + 1) // 256 - base, 0), 8)
+        if row == rows - 1:
+            fill = max(fill, 1)
+        table[sample] = BLOCKS[fill]
+    return table
+
+
+class CavaBars(Widget):
+    """Spectrum bars drawn straight to strips inside a rounded border.
+
+    Border strips and per-row glyph tables are rebuilt only on resize; each
+    frame re-renders the bar rows and refreshes just the ones that changed.
+    """
+
+    DEFAULT_CSS = """
+    CavaBars {
+        height: 100%;
+        width: 100%;
+    }
+    """
+
+    def __init__(self, title: str = "♫", border_style: str = "white", id=None):
+        super().__init__(id=id)
+        self.title = title
+        self.border_style = Style.parse(border_style)
+        self._samples = ""
+        self._tables: list[dict] = []
+        self._rows: list[str] = []
+        self._row_strips: list[Strip] = []
+        self._top = Strip.blank(0)
+        self._bottom = Strip.blank(0)
+
+    def on_resize(self) -> None:
+        width, height = self.size
+        rows = max(height - 2, 1)
+        inner = max(width - 2, 0)
+
+        title = f" {self.title} "
+        left = max(inner - len(title), 0) // 2
+        right = max(inner - len(title) - left, 0)
+        self._top = Strip(
+            [Segment(f"╭{'─' * left}{title}{'─' * right}╮", self.border_style)]
+        )
+        self._bottom = Strip([Segment(f"╰{'─' * inner}╯", self.border_style)])
+        self._left = Segment("│", self.border_style)
+        self._right = Segment("│", self.border_style)
+
+        self._tables = [build_row_table(row, rows) for row in range(rows)]
+        self._rows = [None] * rows
+        self._row_strips = [Strip.blank(width)] * rows
+        self._render_rows()
+        self.refresh()
+
+    def update_frame(self, samples: bytes) -> None:
+        """Show a frame of 8-bit samples, one per bar."""
+        self._samples = samples.decode("latin-1")
+        width = self.size.width
+        for row in self._render_rows():
+            self.refresh(Region(0, row + 1, width, 1))
+
+    def _render_rows(self) -> list[int]:
+        inner = max(self.size.width - 2, 0)
+        text_style = self.rich_style
+        changed = []
+        for row, table in enumerate(self._tables):
+            text = self._samples.translate(table)
+            if text == self._rows[row]:
+                continue
+            self._rows[row] = text
+            text = text[:inner].center(inner)
+            self._row_strips[row] = Strip(
+                [self._left, Segment(text, text_style), self._right], inner + 2
+            )
+            changed.append(row)
+        return changed
+
+    def render_line(self, y: int) -> Strip:
+        last = len(self._row_strips) + 1
+        if y == 0:
+            return self._top
+        if y == last:
+            return self._bottom
+        if 0 < y < last:
+            return self._row_strips[y - 1]
+        return Strip.blank(self.size.width)
@@ -1,35 +1,58 @@
 import asyncio
+import time
+from textual import log
 from textual.widget import Widget
-from textual.widgets import Static
 from textual.containers import Vertical
 from textual.app import ComposeResult, App
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
-import tempfile
-import os
+from textual_app.cava_bars import CavaBars
+from textual_app.spectrum import CavaBackend
+from metrics import REGISTRY
+import sys
 
-
-CAVA_CONFIG = """
-[general]
-bars = 80
-
-[output]
-method = "raw"
-raw_target = "/dev/stdout"
-data_format = "ascii"
-ascii_max_range = 8
-
-[raw]
-bit_format = "8bit"
-"""
+# Offset of the most significant byte of a native-endian 16-bit sample
+HIGH_BYTE = 1 if sys.byteorder == "little" else 0
 
 
 class CavaWidget(Widget):
-    def __init__(self, id: str = "cava-widget"):
+    def __init__(
+        self,
+        id: str = "cava-widget",
+        backend=None,
+        fps=30,
+        silence_seconds=2,
+        unfocused_fps=5,
+        stop_unfocused=False,
+    ):
         super().__init__(id=id)
-        self.cava_display = Static(id="cava-display")
+        self.cava_display = CavaBars(id="cava-display")
         self._cava_task = None
+        self._started = False
+        self.backend = backend or CavaBackend()
+        self.fps = fps
+        # Latest raw frame, kept as read; only painted frames are converted
+        self.frame = b""
+
+        # The reader only ever keeps the newest frame; the paint timer picks
+        # it up at `fps` and anything read in between is dropped
+        self.frames_read = 0
+        self.frames_painted = 0
+        self.frames_dropped = 0
+        self._painted_frame = 0
+        self._painted_last_second = 0
+
+        self._resize_timer = None
+
+        # Idle policy: painting stops after `silence_seconds` of all-zero
+        # frames, and slows to `unfocused_fps` (0 = stops) while unfocused
+        self.silence_seconds = silence_seconds
+        self.unfocused_fps = unfocused_fps
+        self.stop_unfocused = stop_unfocused
+        self.silent = False
+        self.unfocused = False
+        self._last_sound = time.monotonic()
+        self._zero_frame = b""
+        self._paint_timer = None
+        self._paint_fps = 0
 
     def compose(self) -> ComposeResult:
         yield Vertical(
@@ -38,55 +61,128 @@ class CavaWidget(Widget):
         )
 
     async def on_mount(self):
-        # Write a temporary cava config file
-        self.cava_config_path = tempfile.NamedTemporaryFile(delete=False).name
-        with open(self.cava_config_path, "w") as f:
-            f.write(CAVA_CONFIG)
+        self._apply_rate()
+        self.set_interval(1, self.sample_fps)
+
+    def _apply_rate(self) -> None:
+        """Run the paint timer at the rate the idle policy allows."""
+        if self.silent:
+            fps = 0
+        elif self.unfocused:
+            fps = min(self.unfocused_fps, self.fps)
+        else:
+            fps = self.fps
+        if fps == self._paint_fps:
+            return
+        if self._paint_timer is not None:
+            self._paint_timer.stop()
+            self._paint_timer = None
+        if fps and not self._paint_fps:
+            # Frames read while paused are skipped, not counted as dropped
+            self._painted_frame = max(self.frames_read - 1, 0)
+        self._paint_fps = fps
+        if fps:
+            self._paint_timer = self.set_interval(1 / fps, self.paint_frame)
+            self.paint_frame()
+
+    def set_unfocused(self, unfocused: bool) -> None:
+        self.unfocused = unfocused
+        if self.stop_unfocused:
+            if unfocused:
+                self.backend.pause()
+            else:
+                self.backend.resume()
+        self._apply_rate()
+
+    def on_resize(self, event) -> None:
+        # One bar per cell inside the border, so nothing unseen is computed
+        bars = max(event.size.width - 2, 1)
+        if not self._started:
+            self._started = True
+            self.backend.set_bars(bars)
+            # Spawning the backend can wait until the first frame is on screen
+            self.call_after_refresh(self.start_backend)
+        elif bars != self.backend.bars:
+            # Terminal resizes come in bursts; apply once they settle
+            if self._resize_timer is not None:
+                self._resize_timer.stop()
+            self._resize_timer = self.set_timer(
+                0.3, lambda: self.backend.set_bars(bars)
+            )
 
-        # Launch cava and stream output
-        self._cava_task = asyncio.create_task(self.run_cava())
+    def start_backend(self) -> None:
+        if self.is_mounted:
+            self._cava_task = asyncio.create_task(self.run_cava())
+
+    async def set_backend(self, backend) -> None:
+        """Switch to another frame source, e.g. when the daemon goes away."""
+        if self._cava_task is not None:
+            self._cava_task.cancel()
+            self._cava_task = None
+        await self.backend.close()
+        backend.set_bars(self.backend.bars)
+        if self.unfocused and self.stop_unfocused:
+            backend.pause()
+        self.backend = backend
+        if self._started:
+            self.start_backend()
 
     async def run_cava(self):
-        process = await asyncio.create_subprocess_exec(
-            "cava",
-            "-p",
-            self.cava_config_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.DEVNULL,
-        )
-
-        while True:
-            if process.stdout.at_eof():
-                break
-
-            line = await process.stdout.readline()
-            if not line:
-                continue
-
-            # Parse raw ASCII output (one line = list of numbers separated by semicolons)
-            raw = line.decode("utf-8").strip()
-            if not raw:
-                continue
-
-            bars = [int(x) for x in raw.split(";") if x.isdigit()]
-            visual = self.render_bars(bars)
-
-            panel = Panel(
-                Text(visual, justify="center"),
-                title="♫",
-                border_style="white",
-                box=box.ROUNDED,
-            )
-            self.cava_display.update(panel)
-
-    def render_bars(self, bars):
-        # Convert each bar value to blocks
-        return "".join("▁▂▃▄▅▆▇█"[min(val, 7)] for val in bars)
+        async for frame in self.backend.frames():
+            self.frame = frame
+            self.frames_read += 1
+
+            if len(frame) != len(self._zero_frame):
+                self._zero_frame = bytes(len(frame))
+            if frame != self._zero_frame:
+                self._last_sound = time.monotonic()
+                if self.silent:
+                    self.silent = False
+                    self._apply_rate()
+            elif (
+                not self.silent
+                and time.monotonic() - self._last_sound > self.silence_seconds
+            ):
+                # Paint the flat frame once, then stop until sound returns
+                self.paint_frame()
+                self.silent = True
+                self._apply_rate()
+
+    def paint_frame(self):
+        if self.frames_read == self._painted_frame:
+            return
+        dropped = self.frames_read - self._painted_frame - 1
+        self.frames_dropped += dropped
+        self._painted_frame = self.frames_read
+
+        frame = self.frame
+        # 16-bit samples are binned on their high byte alone. The slice copies
+        # one small frame per paint, not per read, and CavaBars needs bytes
+        if self.backend.sample_size == 2:
+            frame = frame[HIGH_BYTE::2]
+        with REGISTRY.time("tux_render_seconds", widget="cava"):
+            self.cava_display.update_frame(frame)
+        self.frames_painted += 1
+        REGISTRY.inc("tux_cava_frames_painted_total")
+        if dropped:
+            REGISTRY.inc("tux_cava_frames_dropped_total", dropped)
+
+    def sample_fps(self):
+        REGISTRY.set("tux_cava_fps", self.frames_painted - self._painted_last_second)
+        self._painted_last_second = self.frames_painted
+
+    def frame_stats(self):
+        return {
+            "read": self.frames_read,
+            "painted": self.frames_painted,
+            "dropped": self.frames_dropped,
+        }
 
     async def on_unmount(self):
-        # Clean up config file
-        if hasattr(self, "cava_config_path"):
-            os.remove(self.cava_config_path)
+        log("Cava frames:", self.frame_stats())
+        if self._cava_task is not None:
+            self._cava_task.cancel()
+        await self.backend.close()
 
 
 class TestApp(App):
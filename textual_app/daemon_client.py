@@ -0,0 +1,119 @@
+import asyncio
+import json
+from array import array
+
+from textual_app.spectrum import SpectrumBackend
+from tuxd import FRAME, HELLO, PAUSE, RESUME, STATE, read_message, write_message
+
+# How long to wait for a daemon before running standalone
+CONNECT_TIMEOUT = 1.0
+
+
+class DaemonClient:
+    """Subscription to a running tuxd: its state updates and spectrum frames."""
+
+    def __init__(self, reader, writer, hello):
+        self.reader = reader
+        self.writer = writer
+        self.bars = hello["bars"]
+        self.sample_size = hello["sample_size"]
+        self.closed = False
+        # Only the newest frame is kept, as in CavaWidget
+        self.frame = None
+        self.frame_ready = asyncio.Event()
+
+    async def run(self, on_state) -> None:
+        """Dispatch messages until the daemon goes away."""
+        try:
+            while True:
+                kind, payload = await read_message(self.reader)
+                if kind == FRAME:
+                    self.frame = payload
+                    self.frame_ready.set()
+                elif kind == STATE:
+                    on_state(json.loads(payload))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            self.frame_ready.set()
+
+    def send(self, kind) -> None:
+        if not self.closed:
+            write_message(self.writer, kind)
+
+    async def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+
+async def connect_daemon(path):
+    """Return a DaemonClient, or None when no daemon answers at `path`."""
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(path), CONNECT_TIMEOUT
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        kind, payload = await asyncio.wait_for(read_message(reader), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        kind = None
+    if kind != HELLO:
+        writer.close()
+        return None
+    return DaemonClient(reader, writer, json.loads(payload))
+
+
+class DaemonBackend(SpectrumBackend):
+    """Frames from tuxd, resampled from its bar count to the widget's.
+
+    Each output bar is the peak of the daemon bars it covers, so narrowing
+    keeps spikes visible; widening repeats bars.
+    """
+
+    def __init__(self, client):
+        super().__init__(client.bars)
+        self.client = client
+        self.sample_size = client.sample_size
+        self._typecode = "H" if self.sample_size == 2 else "B"
+        self._bins = None
+
+    def set_bars(self, bars):
+        self.bars = bars
+        self._bins = None
+
+    def resample(self, frame):
+        view = memoryview(frame)
+        if self.sample_size == 2:
+            view = view.cast("H")
+        source = len(view)
+        if source == self.bars:
+            return frame
+        if self._bins is None or self._bins[-1][1] != source:
+            bars = self.bars
+            self._bins = [
+                (
+                    i * source // bars,
+                    max((i + 1) * source // bars, i * source // bars + 1),
+                )
+                for i in range(bars)
+            ]
+        return array(
+            self._typecode, [max(view[lo:hi]) for lo, hi in self._bins]
+        ).tobytes()
+
+    async def frames(self):
+        client = self.client
+        while True:
+            await client.frame_ready.wait()
+            client.frame_ready.clear()
+            if client.closed:
+                return
+            yield self.resample(client.frame)
+
+    def pause(self):
+        self.client.send(PAUSE)
+
+    def resume(self):
+        self.client.send(RESUME)
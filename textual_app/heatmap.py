@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+from rich import box
+from rich.panel import Panel
+from rich.text import Text
+from textual.widgets import Static
+
+# No commits, then four activity levels
+SHADES = "·░▒▓█"
+WEEKS = 53
+DAY_LABELS = ["", "Mon", "", "Wed", "", "Fri", ""]
+
+
+def shade_levels(counts):
+    """Map each day's count to a SHADES index by quartile of active days.
+
+    Quartiles, as GitHub uses, keep one busy day from flattening the rest.
+    """
+    active = sorted(c for c in counts if c)
+    if not active:
+        return [0] * len(counts)
+    quartiles = [active[len(active) * k // 4] for k in (1, 2, 3)]
+    return [0 if c == 0 else 1 + sum(c > q for q in quartiles) for c in counts]
+
+
+def heatmap_range(today):
+    """First and last day shown: whole weeks, Sunday first, ending this week."""
+    first = today - timedelta(weeks=WEEKS - 1, days=(today.weekday() + 1) % 7)
+    return first, today
+
+
+def render_heatmap(counts, first_day):
+    """Lay daily counts out as weekday rows and week columns, like GitHub."""
+    levels = shade_levels(counts)
+    rows = [Text(f"{label:<4}") for label in DAY_LABELS]
+    for i, level in enumerate(levels):
+        rows[i % 7].append(SHADES[level], style="dim" if level == 0 else "")
+
+    # Month names over the first week of each month, where they fit
+    weeks = (len(levels) + 6) // 7
+    starts = [
+        week
+        for week in range(weeks)
+        if week == 0
+        or (first_day + timedelta(weeks=week)).month
+        != (first_day + timedelta(weeks=week - 1)).month
+    ]
+    months = [" "] * weeks
+    for week, next_week in zip(starts, starts[1:] + [weeks]):
+        name = (first_day + timedelta(weeks=week)).strftime("%b")
+        if next_week - week > len(name):
+            months[week : week + len(name)] = name
+    header = Text("    " + "".join(months))
+    return Text("\n").join([header, *rows])
+
+
+class HeatmapOverlay(Static):
+    """A year of commit activity, drawn over the app while shown."""
+
+    DEFAULT_CSS = """
+    HeatmapOverlay {
+        position: absolute;
+        offset: 2 1;
+        width: 61;
+        height: auto;
+        display: none;
+    }
+    """
+
+    def __init__(self, tux, id=None):
+        super().__init__(id=id)
+        self.tux = tux
+
+    def toggle(self) -> None:
+        self.display = not self.display
+        if self.display:
+            self.update_heatmap()
+
+    def update_heatmap(self) -> None:
+        first, last = heatmap_range(date.today())
+        counts = self.tux.commit_index.daily_counts(first, last)
+        self.update(
+            Panel(
+                render_heatmap(counts, first),
+                title=f"{sum(counts)} commits in the last year",
+                box=box.ROUNDED,
+            )
+        )
@@ -0,0 +1,60 @@
+from rich import box
+from rich.panel import Panel
+from rich.table import Table
+from textual.widgets import Static
+
+from metrics import REGISTRY
+
+
+def _name(name, labels):
+    name = name.removeprefix("tux_")
+    if labels:
+        name += f"[{','.join(str(value) for _, value in labels)}]"
+    return name
+
+
+class MetricsOverlay(Static):
+    """Live table of the metrics registry, drawn over the app while shown."""
+
+    DEFAULT_CSS = """
+    MetricsOverlay {
+        position: absolute;
+        offset: 2 1;
+        width: 56;
+        height: auto;
+        display: none;
+    }
+    """
+
+    def __init__(self, registry=REGISTRY, id=None):
+        super().__init__(id=id)
+        self.registry = registry
+        self._timer = None
+
+    def toggle(self) -> None:
+        self.display = not self.display
+        if self.display:
+            self.update_table()
+            self._timer = self.set_interval(1, self.update_table)
+        elif self._timer is not None:
+            # Nothing is sampled for the overlay while it is hidden
+            self._timer.stop()
+            self._timer = None
+
+    def update_table(self) -> None:
+        table = Table(box=None, expand=True, padding=(0, 1))
+        table.add_column("metric")
+        table.add_column("value", justify="right")
+
+        registry = self.registry
+        for (name, labels), value in sorted(registry.gauges.items()):
+            table.add_row(_name(name, labels), f"{value:g}")
+        for (name, labels), value in sorted(registry.counters.items()):
+            table.add_row(_name(name, labels), f"{value:g}")
+        for (name, labels), summary in sorted(registry.summaries.items()):
+            table.add_row(
+                _name(name, labels),
+                f"p50 {summary.quantile(0.5) * 1000:.2f}ms "
+                f"p95 {summary.quantile(0.95) * 1000:.2f}ms",
+            )
+        self.update(Panel(table, title="Metrics", box=box.ROUNDED))
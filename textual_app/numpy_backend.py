@@ -0,0 +1,172 @@
+import asyncio
+import os
+import stat
+import sys
+import time
+import wave
+
+import numpy as np
+
+from textual_app.spectrum import SpectrumBackend
+
+# Lowest auto-gain reference (log magnitude), so near-silence isn't amplified
+PEAK_FLOOR = 8.0
+
+
+class NumpyBackend(SpectrumBackend):
+    """Built-in analyzer computing bars from 16-bit PCM with NumPy.
+
+    `source` is a WAV file, a FIFO/raw file of s16le samples, or "-" for
+    stdin. Stdin is only for the frame printer below: in the app it is the
+    terminal Textual reads keys from. WAV files are paced in real time; pipes
+    are read as fast as the writer produces audio.
+    """
+
+    def __init__(
+        self,
+        source,
+        bars=80,
+        fps=60,
+        sample_rate=44100,
+        channels=2,
+        window=2048,
+        min_freq=50,
+        max_freq=12000,
+    ):
+        super().__init__(bars)
+        self.source = source
+        self.fps = fps
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.window = window
+        self.min_freq = min_freq
+        self.max_freq = max_freq
+        self._edges_for = None
+
+    def _is_fifo(self):
+        return self.source != "-" and stat.S_ISFIFO(os.stat(self.source).st_mode)
+
+    async def _open(self):
+        """Open the source, returning `(read, close, realtime)`.
+
+        Pipes are read through the event loop so a silent writer never leaves
+        a thread blocked; files are paced in real time instead.
+        """
+        if str(self.source).lower().endswith(".wav"):
+            wav = wave.open(str(self.source), "rb")
+            if wav.getsampwidth() != 2:
+                raise ValueError("only 16-bit WAV files are supported")
+            self.sample_rate = wav.getframerate()
+            self.channels = wav.getnchannels()
+
+            async def read_wav(size):
+                return wav.readframes(size // (self.channels * 2))
+
+            return read_wav, wav.close, True
+
+        if self.source == "-":
+            pipe = sys.stdin.buffer
+        elif self._is_fifo():
+            fd = os.open(self.source, os.O_RDONLY | os.O_NONBLOCK)
+            pipe = os.fdopen(fd, "rb", buffering=0)
+        else:
+            raw = open(self.source, "rb")
+
+            async def read_raw(size):
+                return raw.read(size)
+
+            return read_raw, raw.close, True
+
+        stream = asyncio.StreamReader()
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(stream), pipe
+        )
+
+        async def read_pipe(size):
+            try:
+                return await stream.readexactly(size)
+            except asyncio.IncompleteReadError as e:
+                return e.partial
+
+        return read_pipe, transport.close, False
+
+    def _bin_edges(self):
+        """FFT bin index where each log-spaced bar starts, plus the end."""
+        nyquist_bin = self.window // 2
+        hz_per_bin = self.sample_rate / self.window
+        lo = max(int(self.min_freq / hz_per_bin), 1)
+        hi = min(int(self.max_freq / hz_per_bin), nyquist_bin)
+        edges = np.geomspace(lo, hi, self.bars + 1).astype(np.int64)
+        # Low bars are narrower than one bin; give each at least one
+        for i in range(1, len(edges)):
+            edges[i] = max(edges[i], edges[i - 1] + 1)
+        return np.minimum(edges, nyquist_bin)
+
+    async def frames(self):
+        hann = np.hanning(self.window).astype(np.float32)
+        samples = np.zeros(self.window, dtype=np.float32)
+        levels = np.zeros(0, dtype=np.float32)
+        peak = 1.0
+        self._edges_for = None
+
+        while True:
+            read, close, realtime = await self._open()
+            hop = max(self.sample_rate // self.fps, 1)
+            frame_bytes = self.channels * 2
+            next_frame = time.monotonic()
+            try:
+                while True:
+                    data = await read(hop * frame_bytes)
+                    data = data[: len(data) - len(data) % frame_bytes]
+                    if not data:
+                        break
+                    pcm = np.frombuffer(data, dtype="<i2").reshape(-1, self.channels)
+                    mono = pcm.mean(axis=1, dtype=np.float32)
+                    samples = np.concatenate((samples[len(mono) :], mono))
+                    samples = samples[-self.window :]
+
+                    if self._edges_for != (self.bars, self.sample_rate):
+                        edges = self._bin_edges()
+                        self._edges_for = (self.bars, self.sample_rate)
+                        levels = np.zeros(self.bars, dtype=np.float32)
+
+                    magnitude = np.abs(np.fft.rfft(samples * hann))
+                    bars = np.log1p(np.maximum.reduceat(magnitude, edges[:-1]))
+
+                    # Automatic gain with slow decay, and cava-like bar falloff
+                    peak = max(float(bars.max()), peak * 0.995, PEAK_FLOOR)
+                    levels = np.maximum(bars / peak, levels * 0.85)
+                    yield (np.clip(levels, 0, 1) * 255).astype(np.uint8).tobytes()
+
+                    if realtime:
+                        next_frame += hop / self.sample_rate
+                        await asyncio.sleep(max(next_frame - time.monotonic(), 0))
+            finally:
+                close()
+
+            # A FIFO hits EOF whenever its writer goes away; wait for the next
+            if not self._is_fifo():
+                return
+            await asyncio.sleep(1)
+
+
+async def _print_frames(source, bars):
+    from textual_app.cava_bars import build_row_table
+
+    table = build_row_table(0, 1)
+    backend = NumpyBackend(source, bars=bars)
+    started = time.process_time()
+    count = 0
+    async for frame in backend.frames():
+        print(frame.decode("latin-1").translate(table))
+        count += 1
+    elapsed = time.process_time() - started
+    if count:
+        print(f"{count} frames, {elapsed / count * 1000:.3f} ms CPU per frame")
+
+
+if __name__ == "__main__":
+    # Headless check: python -m textual_app.numpy_backend song.wav [bars]
+    asyncio.run(
+        _print_frames(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 80)
+    )
@@ -0,0 +1,68 @@
+import sys
+import time
+
+# Started as early as the app module allows; everything is relative to this
+START = time.perf_counter()
+
+enabled = False
+import_times = {}
+marks = []
+
+
+class _TimingLoader:
+    """Wraps a module loader to record how long executing the module takes."""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            import_times[module.__name__] = time.perf_counter() - started
+            # Put the real loader back so nothing else sees the wrapper
+            module.__loader__ = self.loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self.loader
+
+
+class _TimingFinder:
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+
+def start():
+    """Begin recording import times; call before the imports to measure."""
+    global enabled
+    enabled = True
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def mark(label):
+    if enabled:
+        marks.append((label, time.perf_counter() - START))
+
+
+def report(file=sys.stderr, top=15):
+    print("Startup profile (ms since launch):", file=file)
+    for label, elapsed in marks:
+        print(f"  {label:<24}{elapsed * 1000:8.1f}", file=file)
+    print(f"Slowest imports (cumulative ms, top {top}):", file=file)
+    slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    for name, elapsed in slowest[:top]:
+        print(f"  {name:<40}{elapsed * 1000:8.1f}", file=file)
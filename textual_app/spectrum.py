@@ -0,0 +1,157 @@
+import asyncio
+import os
+import signal
+import tempfile
+import time
+
+from textual import log
+
+CAVA_CONFIG = """
+[general]
+bars = {bars}
+
+[output]
+method = "raw"
+raw_target = "/dev/stdout"
+data_format = "binary"
+bit_format = "{bit_format}"
+"""
+
+# Seconds to wait before restarting cava after it exits, doubled each time
+RESTART_BACKOFF_MIN = 1
+RESTART_BACKOFF_MAX = 30
+
+
+class SpectrumBackend:
+    """Source of spectrum frames for the visualizer.
+
+    `frames()` yields one bytes object per frame holding one native-endian
+    sample per bar, `sample_size` bytes wide. `set_bars` may be called at any
+    time and takes effect from a later frame.
+    """
+
+    sample_size = 1
+
+    def __init__(self, bars=80):
+        self.bars = bars
+
+    def set_bars(self, bars):
+        self.bars = bars
+
+    async def frames(self):
+        raise NotImplementedError
+        yield
+
+    def pause(self):
+        """Stop producing frames until `resume`, where the source allows it."""
+
+    def resume(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class CavaBackend(SpectrumBackend):
+    """Runs cava in binary raw mode, restarting it with backoff if it exits."""
+
+    def __init__(self, bars=80, bit_format="8bit"):
+        super().__init__(bars)
+        self.bit_format = bit_format
+        self.sample_size = 2 if bit_format == "16bit" else 1
+        self.config_path = None
+        self._process = None
+        self._restart_requested = False
+        self._paused = False
+
+    def set_bars(self, bars):
+        if bars == self.bars:
+            return
+        self.bars = bars
+        if self._process is not None and self._process.returncode is None:
+            self._restart_requested = True
+            self._process.terminate()
+            if self._paused:
+                # A stopped process only acts on SIGTERM once continued
+                self._process.send_signal(signal.SIGCONT)
+
+    async def frames(self):
+        self.config_path = tempfile.NamedTemporaryFile(delete=False).name
+        backoff = RESTART_BACKOFF_MIN
+        while True:
+            with open(self.config_path, "w") as f:
+                f.write(CAVA_CONFIG.format(bars=self.bars, bit_format=self.bit_format))
+
+            started = time.monotonic()
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    "cava",
+                    "-p",
+                    self.config_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                log("cava not found, visualizer disabled")
+                return
+            if self._paused:
+                self._process.send_signal(signal.SIGSTOP)
+
+            frame_size = self.bars * self.sample_size
+            while True:
+                try:
+                    yield await self._process.stdout.readexactly(frame_size)
+                except asyncio.IncompleteReadError:
+                    break
+            await self._process.wait()
+
+            if self._restart_requested:
+                self._restart_requested = False
+                backoff = RESTART_BACKOFF_MIN
+                continue
+            if time.monotonic() - started > RESTART_BACKOFF_MAX:
+                backoff = RESTART_BACKOFF_MIN
+            log("cava exited", self._process.returncode, "restarting in", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+
+    def pause(self):
+        # SIGSTOP leaves cava's audio capture and our pipe intact
+        self._paused = True
+        if self._process is not None and self._process.returncode is None:
+            self._process.send_signal(signal.SIGSTOP)
+
+    def resume(self):
+        self._paused = False
+        if self._process is not None and self._process.returncode is None:
+            self._process.send_signal(signal.SIGCONT)
+
+    async def close(self):
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self.config_path is not None:
+            os.remove(self.config_path)
+            self.config_path = None
+
+
+def make_backend(cava_config):
+    """Build the backend selected by the [cava] config section.
+
+    A numpy `source` of "-" (stdin) is rejected: the app reads keys from it.
+    """
+    if cava_config["backend"] == "numpy":
+        if not cava_config["source"]:
+            raise ValueError("[cava] source is required for the numpy backend")
+        if cava_config["source"] == "-":
+            raise ValueError("[cava] source can't be stdin; use a FIFO instead")
+        # Imported here so numpy stays off the startup path unless selected
+        from textual_app.numpy_backend import NumpyBackend
+
+        return NumpyBackend(
+            cava_config["source"],
+            fps=cava_config["fps"],
+            sample_rate=cava_config["sample_rate"],
+            channels=cava_config["channels"],
+        )
+    return CavaBackend(bit_format=cava_config["bit_format"])
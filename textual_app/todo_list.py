@@ -0,0 +1,123 @@
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Region
+from textual.strip import Strip
+from textual.widget import Widget
+
+BULLET = "◦"
+
+
+class TodoList(Widget):
+    """TODO items drawn line by line inside a rounded border.
+
+    Only the rows in the visible window are ever rendered. Moving the cursor
+    within the window repaints just the old and new rows; the window scrolls
+    to keep the selection in view.
+    """
+
+    DEFAULT_CSS = """
+    TodoList {
+        height: 100%;
+        width: 100%;
+    }
+    """
+
+    def __init__(self, items: list[str], title: str = "TODO", id=None):
+        super().__init__(id=id)
+        # Shared with the owner, which edits it and then calls `items_changed`
+        self.items = items
+        self.title = title
+        self.selected = 0
+        self.top = 0
+        self.border_style = Style.parse("white")
+        self.selected_style = Style(bold=True)
+        self._top_strip = Strip.blank(0)
+        self._bottom_strip = Strip.blank(0)
+
+    @property
+    def rows(self) -> int:
+        return max(self.size.height - 2, 1)
+
+    def on_resize(self) -> None:
+        self._build_border()
+        self._scroll_to(self.selected)
+        self.refresh()
+
+    def _build_border(self) -> None:
+        inner = max(self.size.width - 2, 0)
+        title = f" {self.title} "[:inner]
+        right = max(inner - len(title) - 1, 0)
+        self._top_strip = Strip(
+            [Segment(f"╭─{title}{'─' * right}"[: inner + 1] + "╮", self.border_style)]
+        )
+        self._bottom_strip = Strip([Segment(f"╰{'─' * inner}╯", self.border_style)])
+
+    def set_items(self, items, title: str = "TODO") -> None:
+        """Show a different list, such as search results, from the top."""
+        self.items = items
+        self.title = title
+        self.selected = 0
+        self.top = 0
+        self._build_border()
+        self.refresh()
+
+    def _scroll_to(self, index: int) -> bool:
+        """Move the window so `index` is visible; return True if it moved."""
+        top = self.top
+        if index < top:
+            top = index
+        elif index >= top + self.rows:
+            top = index - self.rows + 1
+        top = max(min(top, len(self.items) - self.rows), 0)
+        if top == self.top:
+            return False
+        self.top = top
+        return True
+
+    def _refresh_item(self, index: int) -> None:
+        y = index - self.top + 1
+        if 1 <= y <= self.rows:
+            self.refresh(Region(0, y, self.size.width, 1))
+
+    def select(self, index: int) -> None:
+        """Move the cursor to `index`, repainting as little as possible."""
+        previous = self.selected
+        self.selected = index
+        if self._scroll_to(index):
+            self.refresh()
+        else:
+            self._refresh_item(previous)
+            self._refresh_item(index)
+
+    def items_changed(self, start: int = 0) -> None:
+        """Repaint after the items from `start` onward changed."""
+        self.selected = min(self.selected, max(len(self.items) - 1, 0))
+        self._scroll_to(self.selected)
+        # Rows above `start` are unchanged; the rest of the window shifted
+        y = max(start - self.top, 0) + 1
+        self.refresh(Region(0, y, self.size.width, self.rows - y + 1))
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        if y == 0:
+            return self._top_strip
+        if y == self.rows + 1:
+            return self._bottom_strip
+        if y > self.rows + 1:
+            return Strip.blank(width)
+
+        inner = max(width - 2, 0)
+        index = self.top + y - 1
+        if index < len(self.items):
+            if index == self.selected:
+                text = f"► {BULLET} {self.items[index]}"
+                style = self.rich_style + self.selected_style
+            else:
+                text = f"  {BULLET} {self.items[index]}"
+                style = self.rich_style
+            segment = Segment(text[:inner].ljust(inner), style)
+        else:
+            segment = Segment(" " * inner, self.rich_style)
+        left = Segment("│", self.border_style)
+        right = Segment("│", self.border_style)
+        return Strip([left, segment, right], width)
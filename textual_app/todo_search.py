@@ -0,0 +1,88 @@
+import re
+
+
+class TodoIndex:
+    """Character index over TODO items for incremental fuzzy search.
+
+    Each item gets a stable id, and `ids` mirrors the list's order. Edits are
+    applied here as well as to the store, so the index is never rebuilt.
+    A query matches an item when its characters appear in order, ignoring
+    case. The item must also contain every distinct query character, so
+    intersecting those posting sets gives the candidates to check.
+    """
+
+    def __init__(self, items):
+        self.ids: list[int] = []
+        self.texts: dict[int, str] = {}
+        self._folded: dict[int, str] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._positions = None
+        self._next_id = 0
+        for text in items:
+            self.insert(len(self.ids), text)
+
+    def insert(self, at, text):
+        item_id = self._next_id
+        self._next_id += 1
+        self.ids.insert(at, item_id)
+        self.texts[item_id] = text
+        self._folded[item_id] = folded = text.casefold()
+        for char in set(folded):
+            self._postings.setdefault(char, set()).add(item_id)
+        self._positions = None
+        return item_id
+
+    def delete(self, at):
+        item_id = self.ids.pop(at)
+        del self.texts[item_id]
+        for char in set(self._folded.pop(item_id)):
+            posting = self._postings[char]
+            posting.discard(item_id)
+            if not posting:
+                del self._postings[char]
+        self._positions = None
+
+    def move(self, at, to):
+        self.ids.insert(to, self.ids.pop(at))
+        self._positions = None
+
+    def position(self, item_id):
+        """Return the item's index in the list."""
+        # Rebuilt at most once per edit, not per lookup
+        if self._positions is None:
+            self._positions = dict(zip(self.ids, range(len(self.ids))))
+        return self._positions[item_id]
+
+    def search(self, query, within=None):
+        """Return ids matching `query`, in list order.
+
+        `within` is a previous result for a prefix of `query`. Since longer
+        queries only narrow, only those ids are re-checked.
+        """
+        query = query.casefold()
+        if not query:
+            return list(self.ids)
+        pattern = re.compile(".*?".join(map(re.escape, query)))
+
+        if within is None:
+            postings = [self._postings.get(char, set()) for char in set(query)]
+            candidates = set.intersection(*sorted(postings, key=len))
+            matches = [i for i in candidates if pattern.search(self._folded[i])]
+            matches.sort(key=self.position)
+            return matches
+        return [i for i in within if pattern.search(self._folded[i])]
+
+
+class SearchResults:
+    """Read-only list of the texts for a set of matched ids."""
+
+    def __init__(self, index, ids, query):
+        self.index = index
+        self.ids = ids
+        self.query = query
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        return self.index.texts[self.ids[row]]
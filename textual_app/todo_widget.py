@@ -1,27 +1,37 @@
 from textual.widget import Widget
-from textual.widgets import Static, Input
+from textual.widgets import Input
 from textual.containers import Vertical
 from textual.app import ComposeResult
 from textual.events import Key
 
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
-
 from .todo_item import TodoItem
+from .todo_list import TodoList
+from .todo_search import TodoIndex, SearchResults
+from todo_store import TodoStore
+from metrics import REGISTRY
 
 
 class TodoWidget(Widget):
     can_focus = True  # <-- so widget receives key events
 
-    def __init__(self, id: str = "todo-widget"):
+    def __init__(self, id: str = "todo-widget", store=None):
         super().__init__(id=id)
-        self.todos: list[str] = []
+        self.store = store or TodoStore()
+        # The store's list, edited only through the store so it is journaled
+        self.todos: list[str] = self.store.items
+        # Another app has the list open for writing; edits here aren't saved
+        self.title = "TODO (read-only)" if self.store.read_only else "TODO"
         self.selected_index: int = 0
         self.insert_mode: bool = False
+        # "/" types a query into the input instead of a new item
+        self.search_mode: bool = False
+        # Built on the first search, then kept in step with every edit
+        self.index = None
+        # Current SearchResults while a filter is applied, else None
+        self.results = None
 
     def compose(self) -> ComposeResult:
-        self.todo_display = Static(id="todo-display")
+        self.todo_display = TodoList(self.todos, title=self.title, id="todo-display")
         self.input = Input(placeholder="TODO:", id="todo-input")
 
         yield Vertical(
@@ -45,47 +55,93 @@ class TodoWidget(Widget):
         container.styles.max_width = 35
 
         self.todo_display.styles.height = "32"
-        self.todo_display.styles.overflow = "auto"
-        self.todo_display.styles.scrollbar_size_vertical = 1
         self.input.styles.dock = "bottom"
 
         # Not in insert mode: blur input and focus this widget so keys work immediately
         self.insert_mode = True
         self.input.focus()
 
-        await self.update_display()
+    def select(self, index: int) -> None:
+        self.selected_index = index
+        self.todo_display.select(index)
 
-    async def update_display(self):
-        lines = []
+    def visible(self):
+        """The list j/k/x act on: the search results or every item."""
+        return self.results if self.results is not None else self.todos
 
-        for i, todo in enumerate(self.todos):
-            bullet = "◦"
-            if i == self.selected_index:
-                line = Text(f"► {bullet} {todo}", style="bold")
-            else:
-                line = Text(f"  {bullet} {todo}")
-            lines.append(line)
-
-        todo_text = Text()
-        for line in lines:
-            todo_text.append(line)
-            todo_text.append("\n")
-
-        panel = Panel(
-            todo_text,
-            title="TODO",
-            box=box.ROUNDED,
-            width=50,
-        )
-        self.todo_display.update(panel)
+    def start_search(self) -> None:
+        if self.index is None:
+            self.index = TodoIndex(self.todos)
+        self.search_mode = True
+        self.input.placeholder = "/"
+        self.input.value = ""
+        self.input.focus()
+        self.filter("")
+
+    def filter(self, query: str) -> None:
+        previous = self.results
+        # A longer query only narrows, so re-check the previous matches only
+        if previous is not None and previous.query and query.startswith(previous.query):
+            ids = self.index.search(query, within=previous.ids)
+        else:
+            ids = self.index.search(query)
+        self.results = SearchResults(self.index, ids, query)
+        self.selected_index = 0
+        self.todo_display.set_items(self.results, title=f"/{query}")
+
+    def clear_search(self) -> None:
+        self.search_mode = False
+        self.input.placeholder = "TODO:"
+        self.input.value = ""
+        if self.results is not None:
+            # Keep the cursor on the item it was on
+            selected = self.selected_index
+            item_ids = self.results.ids
+            self.results = None
+            self.todo_display.set_items(self.todos, title=self.title)
+            if item_ids:
+                self.select(self.index.position(item_ids[selected]))
+
+    def add_item(self, text: str) -> int:
+        with REGISTRY.time("tux_todo_op_seconds", op="add"):
+            index = self.store.add(text)
+            if self.index is not None:
+                self.index.insert(index, text)
+        return index
+
+    def delete_item(self, index: int) -> None:
+        with REGISTRY.time("tux_todo_op_seconds", op="delete"):
+            self.store.delete(index)
+            if self.index is not None:
+                self.index.delete(index)
+
+    def move_item(self, index: int, target: int) -> None:
+        with REGISTRY.time("tux_todo_op_seconds", op="move"):
+            self.store.move(index, target)
+            if self.index is not None:
+                self.index.move(index, target)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if self.search_mode:
+            self.filter(event.value)
 
     async def on_input_submitted(self, event: Input.Submitted):
+        if self.search_mode:
+            # Keep the filter and navigate the results
+            self.search_mode = False
+            self.input.placeholder = "TODO:"
+            self.input.value = ""
+            self.insert_mode = False
+            self.input.blur()
+            self.focus()
+            return
+
         value = event.value.strip()
         if value:
-            self.todos.append(value)
+            index = self.add_item(value)
             self.input.value = ""
-            self.selected_index = len(self.todos) - 1
-            await self.update_display()
+            self.todo_display.items_changed(index)
+            self.select(index)
 
         # Stay in insert mode after submitting; keep input focused for easy entry
         self.insert_mode = True
@@ -94,31 +150,60 @@ class TodoWidget(Widget):
     async def on_key(self, event: Key) -> None:
         if self.insert_mode:
             if event.key == "escape":
+                if self.search_mode:
+                    self.clear_search()
                 self.insert_mode = False
                 self.input.blur()
                 self.focus()
                 event.stop()
             return
 
-        if not self.todos:
+        if event.key == "slash":
+            self.insert_mode = True
+            self.start_search()
+            event.stop()
+            return
+        if event.key == "escape" and self.results is not None:
+            self.clear_search()
+            event.stop()
+            return
+
+        items = self.visible()
+        if not items:
             return
 
         if event.key == "j":
-            self.selected_index = (self.selected_index + 1) % len(self.todos)
-            await self.update_display()
+            self.select((self.selected_index + 1) % len(items))
             event.stop()
         elif event.key == "k":
-            self.selected_index = (self.selected_index - 1) % len(self.todos)
-            await self.update_display()
+            self.select((self.selected_index - 1) % len(items))
+            event.stop()
+        elif event.key in ("J", "K") and self.results is None:
+            # Move the selected item down/up, wrapping like j/k
+            step = 1 if event.key == "J" else -1
+            target = (self.selected_index + step) % len(self.todos)
+            if target != self.selected_index:
+                self.move_item(self.selected_index, target)
+                self.todo_display.items_changed(min(self.selected_index, target))
+                self.select(target)
             event.stop()
         elif event.key == "x":
-            self.todos.pop(self.selected_index)
-            self.selected_index = max(0, self.selected_index - 1)
-            await self.update_display()
+            if self.results is not None:
+                # Delete the matched item from the full list and the results
+                item_id = self.results.ids.pop(self.selected_index)
+                self.delete_item(self.index.position(item_id))
+            else:
+                self.delete_item(self.selected_index)
+            self.todo_display.items_changed(self.selected_index)
+            self.select(max(0, self.selected_index - 1))
             event.stop()
         elif event.key == "a":
+            self.clear_search()
             self.insert_mode = True
             self.input.focus()
             event.stop()
         elif event.key == "escape":
             event.stop()
+
+    def on_unmount(self) -> None:
+        self.store.close()
@@ -1,39 +1,53 @@
-from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from github_api import get_recent_commits
+from commit_index import CommitIndex
+from textual_app.ascii_loader import ASCII_FRAMES, preload_ascii_frames
+
+# Each mood lasts until the newest commit is this old; after the last, "dead"
+MOOD_LIMITS = [
+    ("happy", timedelta(hours=4)),
+    ("neutral", timedelta(days=1)),
+    ("sad", timedelta(days=2)),
+]
+
+
+def mood_for_age(delta):
+    for mood, limit in MOOD_LIMITS:
+        if delta < limit:
+            return mood
+    return "dead"
 
 
 class Tux:
-    def __init__(self, username, repo):
+    def __init__(self, username, repo, repos=None, store=None):
         self.username = username
-        self.repo = repo
+        self.repos = repos or ([f"{username}/{repo}"] if repo else [])
+        # Without the legacy `repo` key, the first tracked repo stands in for it
+        self.repo = repo or (self.repos[0].split("/", 1)[1] if self.repos else None)
+        # Optional CommitStore holding the synced commit history
+        self.store = store
+        # Newest commit time per "owner/name", None until fetched
+        self.repo_status = {}
+        # Commits in the last 24h per repo, when the backend reports them
+        self.repo_recent_commits = {}
         self.last_commit_time = None
         self.last_commit_data = []
+        # Sorted author times backing the commit counts and the heatmap
+        self.commit_index = CommitIndex()
+        # Counts from the warm-start snapshot, used until the index loads
+        self.saved_counts = None
         self.mood = "neutral"
 
         # Animation
         self.frame_index = 0
-        self.frames_by_mood = {
-            "happy": [],
-            "neutral": [],
-            "sad": [],
-            "dead": [],  # Optional: you can add dead frames if desired
-        }
+        self.frames_by_mood = {}
 
         self.load_frames()
 
     def load_frames(self):
-        assets_dir = Path(__file__).parent / "assets"
-        for mood in ["happy", "neutral", "sad"]:
-            for i in range(1, 3):  # frame_1.txt, frame_2.txt
-                frame_file = assets_dir / f"{mood}_{i}.txt"
-                if frame_file.exists():
-                    self.frames_by_mood[mood].append(frame_file.read_text())
-                else:
-                    self.frames_by_mood[mood].append(f"[Missing: {mood}_{i}.txt]")
-
-        # Optional: Dead mood default frame
-        # self.frames_by_mood["dead"] = ["(×_×)", "(RIP)"]
+        if not ASCII_FRAMES:
+            preload_ascii_frames()
+        self.frames_by_mood = ASCII_FRAMES
 
     def get_current_frames(self):
         return self.frames_by_mood.get(self.mood, ["(?)", "(?)"])
@@ -46,26 +60,44 @@ class Tux:
         self.frame_index += 1
 
     def update_mood(self, commit_time=None):
-        if commit_time:
+        """Recompute the mood; return True if it changed."""
+        # The newest commit only moves forward; an older time is stale data
+        if commit_time and (
+            self.last_commit_time is None or commit_time > self.last_commit_time
+        ):
             self.last_commit_time = commit_time
 
+        previous = self.mood
         if self.last_commit_time is None:
             self.mood = "neutral"
-            return
-
-        delta = datetime.now(timezone.utc) - self.last_commit_time
-
-        if delta < timedelta(hours=4):
-            self.mood = "happy"
-        elif delta < timedelta(days=1):
-            self.mood = "neutral"
-        elif delta < timedelta(days=2):
-            self.mood = "sad"
         else:
-            self.mood = "dead"
+            self.mood = mood_for_age(datetime.now(timezone.utc) - self.last_commit_time)
+        return self.mood != previous
+
+    def update_repo_status(self, commit_times):
+        """Merge per-repo commit times and base the mood on the newest one.
+
+        A None time (a failed fetch) keeps the repo's last known time.
+        """
+        self.repo_status.update(
+            {repo: t for repo, t in commit_times.items() if t is not None}
+        )
+        for repo in commit_times:
+            self.repo_status.setdefault(repo, None)
+        known = [t for t in self.repo_status.values() if t is not None]
+        if known:
+            return self.update_mood(max(known))
+        return False
+
+    def most_recent_repo(self):
+        known = {r: t for r, t in self.repo_status.items() if t is not None}
+        if not known:
+            return None
+        return max(known, key=known.get)
 
     def fetch_commits(self):
-        self.last_commit_data = get_recent_commits(self.username, self.repo)
+        owner, name = self.repos[0].split("/", 1)
+        self.last_commit_data = get_recent_commits(owner, name)
         if self.last_commit_data:
             commit_time_str = self.last_commit_data[0]["commit"]["committer"]["date"]
             commit_time_dt = datetime.strptime(
@@ -73,45 +105,65 @@ class Tux:
             ).replace(tzinfo=timezone.utc)
             self.last_commit_time = commit_time_dt
             self.update_mood(commit_time_dt)
+        self.commit_index = CommitIndex.from_commits(self.last_commit_data)
+
+    def refresh_commit_index(self):
+        """Reload the commit index from the store; blocking, so run off-loop."""
+        if self.store is not None:
+            self.commit_index = CommitIndex(self.store.authored_times(self.repos))
 
     def time_since_commit(self):
         if self.last_commit_time is None:
             return None
         return datetime.now(timezone.utc) - self.last_commit_time
 
-    def time_until_next_mood(self):
-        delta = self.time_since_commit()
-        if delta is None:
+    def next_mood_deadline(self):
+        """Return when the current mood ends, or None if it never will."""
+        if self.last_commit_time is None:
             return None
+        for mood, limit in MOOD_LIMITS:
+            if mood == self.mood:
+                return self.last_commit_time + limit
+        return None
 
-        if self.mood == "happy":
-            return timedelta(hours=4) - delta
-        elif self.mood == "neutral":
-            return timedelta(days=1) - delta
-        elif self.mood == "sad":
-            return timedelta(days=2) - delta
-        else:
+    def time_until_next_mood(self):
+        deadline = self.next_mood_deadline()
+        if deadline is None:
             return None
+        return deadline - datetime.now(timezone.utc)
 
     def get_commit_counts(self):
-        if not self.last_commit_data:
-            return {"24h": 0, "7d": 0}
-
-        now = datetime.utcnow()
-        count_24h = 0
-        count_7d = 0
-
-        for commit in self.last_commit_data:
-            commit_time = datetime.strptime(
-                commit["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ"
-            )
-            delta = now - commit_time
-            if delta.total_seconds() < 86400:
-                count_24h += 1
-            if delta.total_seconds() < 604800:
-                count_7d += 1
-
-        return {"24h": count_24h, "7d": count_7d}
+        if not self.commit_index and self.saved_counts:
+            return self.saved_counts
+        return self.commit_index.window_counts()
+
+    def to_snapshot(self):
+        """Return the state needed to draw Tux before the first poll."""
+        return {
+            "repo_status": {
+                repo: t.isoformat() for repo, t in self.repo_status.items() if t
+            },
+            "repo_recent_commits": self.repo_recent_commits,
+            "mood": self.mood,
+            "commit_counts": self.get_commit_counts(),
+        }
+
+    def restore_snapshot(self, snapshot):
+        """Load state from `to_snapshot`, keeping only still-tracked repos."""
+        self.repo_status = {
+            repo: datetime.fromisoformat(t)
+            for repo, t in snapshot.get("repo_status", {}).items()
+            if repo in self.repos
+        }
+        self.repo_recent_commits = {
+            repo: n
+            for repo, n in snapshot.get("repo_recent_commits", {}).items()
+            if repo in self.repos
+        }
+        self.saved_counts = snapshot.get("commit_counts")
+        self.mood = snapshot.get("mood", self.mood)
+        # The saved mood may have expired while the app was closed
+        self.update_repo_status({})
 
     def get_summary(self):
         return {
@@ -1,66 +1,129 @@
+from functools import lru_cache
+from textual import log
 from textual.timer import Timer
+from textual.message import Message
 from textual.widget import Widget
 from textual.reactive import reactive
 from rich.panel import Panel
-from rich.columns import Columns
 from rich.text import Text
 from rich import box
-from datetime import datetime
-from textual.widgets import Static
-from textual_app.ui import CustomStyles
+from metrics import REGISTRY
+from textual_app.ascii_loader import get_frames
 from textual_app.ui_helpers import (
     load_ascii,
+    seconds_until_display_change,
     format_timedelta,
     generate_block_bar,
-    center_ascii,
 )
 
+RENDER_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def build_panel(art, mood, repo_text, last_commit_text, hunger_text):
+    """Build the Tux panel; cached on everything visible in it."""
+    tux_lines = [
+        art,
+        "",
+        f"[bold]Mood:[/bold] {mood.upper()}",
+        f"[bold]Repo:[/bold] {repo_text}",
+        f"[bold]Committed:[/bold] {last_commit_text}",
+    ]
+    if hunger_text:
+        tux_lines.append(f"[bold]Hungry in:[/bold] {hunger_text}")
+
+    return Panel.fit(
+        Text.from_markup("\n".join(tux_lines)),
+        title="Tuxagotchi",
+        width=60,
+        box=box.ROUNDED,
+    )
+
 
 class TuxWidget(Widget):
     tick = reactive(0)
 
+    class MoodChanged(Message):
+        """Posted when Tux's mood changes, from new commits or elapsed time."""
+
+        def __init__(self, previous: str, mood: str):
+            super().__init__()
+            self.previous = previous
+            self.mood = mood
+
     def __init__(self, tux, repo_name: str):
         super().__init__()
         self.tux = tux
         self.repo_name = repo_name
         self.tick = 0
+        self.mood = tux.mood
         self._timer: Timer | None = None
+        self._deadline_timer: Timer | None = None
 
     def on_mount(self):
-        # Set a timer to increment tick every 0.5 seconds
+        # Animation frames advance every 2 seconds
         self._timer = self.set_interval(2, self.increment_tick)
+        self.check_mood()
 
     def increment_tick(self):
-        self.tick += 1
+        # Only the art and the hunger bar animate; skip ticks that change neither
+        if len(get_frames(self.tux.mood)) > 1 or self.tux.time_until_next_mood():
+            self.tick += 1
+
+    def set_animated(self, animated: bool) -> None:
+        """Pause or resume the animation; mood deadlines keep running."""
+        if self._timer is None:
+            return
+        if animated:
+            self._timer.resume()
+            self.increment_tick()
+        else:
+            self._timer.pause()
+
+    def check_mood(self):
+        """Re-evaluate the mood, repaint and wait for the next visible change.
+
+        Called when new commit data arrives and by a single timer set for the
+        next moment the panel would look different.
+        """
+        self.tux.update_mood()
+        if self.tux.mood != self.mood:
+            self.post_message(self.MoodChanged(self.mood, self.tux.mood))
+            self.mood = self.tux.mood
         self.refresh()
 
+        if self._deadline_timer is not None:
+            self._deadline_timer.stop()
+            self._deadline_timer = None
+        delay = seconds_until_display_change(self.tux)
+        if delay is not None:
+            self._deadline_timer = self.set_timer(delay, self.check_mood)
+
     def render(self) -> Panel:
-        art = center_ascii(load_ascii(self.tux.mood, self.tick))
-        last_commit_td = self.tux.time_since_commit()
-        countdown_td = self.tux.time_until_next_mood()
-
-        last_commit_text = "Unknown"
-        if last_commit_td:
-            last_commit_text = f"{format_timedelta(last_commit_td)} ago"
-
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        tux_lines = [
-            art,
-            "",
-            f"[bold]Mood:[/bold] {self.tux.mood.upper()}",
-            f"[bold]Repo:[/bold] {self.repo_name}",
-            f"[bold]Committed:[/bold] {last_commit_text}",
-        ]
-        if countdown_td:
-            hunger_bar = generate_block_bar(self.tux, self.tick, length=10)
-            tux_lines.append(
-                f"[bold]Hungry in:[/bold] {format_timedelta(countdown_td)} {hunger_bar}"
-            )
+        with REGISTRY.time("tux_render_seconds", widget="tux"):
+            art = load_ascii(self.tux.mood, self.tick)
+            last_commit_td = self.tux.time_since_commit()
+            countdown_td = self.tux.time_until_next_mood()
+
+            last_commit_text = "Unknown"
+            if last_commit_td:
+                last_commit_text = f"{format_timedelta(last_commit_td)} ago"
 
-        return Panel.fit(
-            Text.from_markup("\n".join(tux_lines)),
-            title="Tuxagotchi",
-            width=60,
-            box=box.ROUNDED,
-        )
+            repo_text = self.repo_name
+            if len(self.tux.repos) > 1:
+                active = self.tux.most_recent_repo() or "Unknown"
+                repo_text = f"{active} (+{len(self.tux.repos) - 1} more)"
+
+            hunger_text = None
+            if countdown_td:
+                hunger_bar = generate_block_bar(self.tux, self.tick, length=10)
+                hunger_text = f"{format_timedelta(countdown_td)} {hunger_bar}"
+
+            misses = build_panel.cache_info().misses
+            panel = build_panel(
+                art, self.tux.mood, repo_text, last_commit_text, hunger_text
+            )
+            info = build_panel.cache_info()
+            if info.misses != misses:
+                log("TuxWidget render cache miss:", info)
+            return panel
@@ -2,29 +2,12 @@ from typing import Optional
 from datetime import timedelta
 import os
 from textual.widgets import Static
+from textual_app.ascii_loader import get_frames
 
 
 def load_ascii(mood: str, tick: int) -> str:
-    base_path = f"assets/{mood}.txt"
-    alt_path = f"assets/{mood}2.txt"
-
-    try:
-        with open(base_path) as f:
-            base_lines = f.readlines()
-    except FileNotFoundError:
-        base_lines = ["(?)\n"]
-
-    try:
-        with open(alt_path) as f:
-            alt_lines = f.readlines()
-    except FileNotFoundError:
-        alt_lines = base_lines
-
-    max_height = max(len(base_lines), len(alt_lines))
-    base_lines += ["\n"] * (max_height - len(base_lines))
-    alt_lines += ["\n"] * (max_height - len(alt_lines))
-
-    return "".join(base_lines if tick % 2 == 0 else alt_lines)
+    frames = get_frames(mood)
+    return frames[tick % len(frames)]
 
 
 tux_style = "bold white"
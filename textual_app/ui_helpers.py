@@ -1,13 +1,13 @@
 from datetime import timedelta
 from typing import Optional
-from textual_app.ascii_loader import ASCII_FRAMES
+from textual_app.ascii_loader import get_frames
+from config import get_config_dir
 from pathlib import Path
-import os
 
 
 def load_ascii(mood: str, tick: int) -> str:
-    frame_index = tick % 2
-    return ASCII_FRAMES.get(mood, ["[Missing mood]"] * 2)[frame_index]
+    frames = get_frames(mood)
+    return frames[tick % len(frames)]
 
 
 def format_timedelta(td: timedelta) -> str:
@@ -22,6 +22,45 @@ def format_timedelta(td: timedelta) -> str:
         return f"{seconds // 86400}d"
 
 
+def _display_unit(seconds: float) -> int:
+    """Seconds per step of the unit `format_timedelta` shows for `seconds`."""
+    if seconds < 60:
+        return 1
+    elif seconds < 3600:
+        return 60
+    elif seconds < 86400:
+        return 3600
+    else:
+        return 86400
+
+
+def seconds_until_display_change(tux: object, length: int = 10) -> Optional[float]:
+    """
+    Seconds until anything the Tux panel shows changes: the mood, the
+    "ago" and "Hungry in" text or the filled part of the hunger bar.
+    Returns None when nothing is time dependent.
+    """
+    since = tux.time_since_commit()
+    if since is None:
+        return None
+    elapsed = since.total_seconds()
+    unit = _display_unit(elapsed)
+    delays = [unit - elapsed % unit]
+
+    countdown = tux.time_until_next_mood()
+    if countdown is not None:
+        remaining = max(countdown.total_seconds(), 0)
+        # The mood itself changes when the countdown runs out
+        delays.append(remaining)
+        delays.append(remaining % _display_unit(remaining))
+        total = {"happy": 4 * 3600, "neutral": 24 * 3600}.get(tux.mood)
+        if total:
+            delays.append(remaining % (total / length))
+
+    # Land just past the boundary so the new value is what gets drawn
+    return min(delays) + 0.01
+
+
 def generate_block_bar(tux: object, tick: int, length: int = 10) -> str:
     """
     Generate a block progress bar indicating time until next mood change.
@@ -57,19 +96,8 @@ def center_ascii(art: str, width: int = 32) -> str:
     return "\n".join(line.center(width) for line in lines)
 
 
-def get_config_dir() -> Path:
-    """Return the config directory path, respecting XDG_CONFIG_HOME or default."""
-    return (
-        Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "tuxagotchi"
-    )
-
-
 def get_css_path() -> Path:
-    return (
-        Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
-        / "tuxagotchi"
-        / "styles.css"
-    )
+    return get_config_dir() / "styles.css"
 
 
 def generate_css(colors: dict) -> str:
@@ -0,0 +1,168 @@
+import fcntl
+import json
+import os
+import queue
+import threading
+from config import get_config_dir
+
+# Compact once the journal holds this many ops beyond the snapshot
+COMPACT_AFTER = 1000
+
+
+class TodoStore:
+    """TODO list persisted as a snapshot plus an append-only journal.
+
+    Every edit appends one JSON line to `todos.journal`. Every line has a
+    sequence number. Once the journal grows past `COMPACT_AFTER` ops, the
+    whole list goes to `todos.json`. That write replaces the file
+    atomically, then the journal is truncated. On load, journal ops already
+    in the snapshot are skipped, and a torn last line is dropped. All file
+    writes happen on a background thread, in the order the edits were made.
+
+    Only one store may write a directory: it holds an exclusive lock on the
+    journal. Another store opened meanwhile (a second app, say) is
+    `read_only`. It shows the list as loaded and keeps its edits in memory.
+    """
+
+    def __init__(self, path=None, compact_after=COMPACT_AFTER):
+        directory = path or get_config_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = directory / "todos.json"
+        self.journal_path = directory / "todos.journal"
+        self.compact_after = compact_after
+
+        self.items: list[str] = []
+        self.seq = 0
+        self._journal_ops = 0
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        try:
+            fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another store owns the files; writing too would lose edits
+            self._journal.close()
+            self.read_only = True
+            self._load()
+            return
+        self.read_only = False
+        self._load()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="todo-store", daemon=True
+        )
+        self._writer.start()
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            self.items = snapshot["items"]
+            self.seq = snapshot["seq"]
+        except FileNotFoundError:
+            pass
+
+        good_bytes = 0
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    good_bytes += len(line)
+                    if op["seq"] <= self.seq:
+                        continue
+                    self._apply(op)
+                    self.seq = op["seq"]
+                    self._journal_ops += 1
+        except FileNotFoundError:
+            return
+        # Drop a line torn by a crash so later appends start on a clean line
+        if not self.read_only and good_bytes != os.path.getsize(self.journal_path):
+            os.truncate(self.journal_path, good_bytes)
+
+    def _apply(self, op):
+        kind = op["op"]
+        if kind == "add":
+            self.items.insert(op["at"], op["text"])
+        elif kind == "del":
+            del self.items[op["at"]]
+        elif kind == "move":
+            self.items.insert(op["to"], self.items.pop(op["at"]))
+
+    def _record(self, op):
+        self.seq += 1
+        op["seq"] = self.seq
+        self._apply(op)
+        if self.read_only:
+            return
+        self._queue.put(("append", json.dumps(op) + "\n"))
+        self._journal_ops += 1
+        if self._journal_ops >= self.compact_after:
+            self.compact()
+
+    def add(self, text, at=None):
+        """Insert `text` at index `at`, or append it, and return its index."""
+        if at is None:
+            at = len(self.items)
+        self._record({"op": "add", "at": at, "text": text})
+        return at
+
+    def delete(self, at):
+        self._record({"op": "del", "at": at})
+
+    def move(self, at, to):
+        self._record({"op": "move", "at": at, "to": to})
+
+    def compact(self):
+        """Queue a snapshot of the current list and a journal truncation."""
+        if self.read_only:
+            return
+        self._journal_ops = 0
+        snapshot = json.dumps({"seq": self.seq, "items": self.items})
+        self._queue.put(("snapshot", snapshot))
+
+    def _write_loop(self):
+        journal = self._journal
+        while True:
+            kind, payload = self._queue.get()
+            if kind == "append":
+                # Batch up whatever else is already queued into one write
+                chunks = [payload]
+                while True:
+                    try:
+                        kind, payload = self._queue.get_nowait()
+                    except queue.Empty:
+                        kind = None
+                        break
+                    if kind != "append":
+                        break
+                    chunks.append(payload)
+                journal.write("".join(chunks))
+                journal.flush()
+                os.fsync(journal.fileno())
+            if kind == "snapshot":
+                tmp_path = self.snapshot_path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+                # Ops up to the snapshot's seq are now redundant
+                journal.truncate(0)
+            elif kind == "close":
+                # Closing also releases the lock
+                journal.close()
+                return
+
+    def close(self):
+        """Flush pending writes, compacting first if the journal is non-empty."""
+        if self.read_only:
+            return
+        if self._journal_ops:
+            self.compact()
+        self._queue.put(("close", None))
+        self._writer.join()
@@ -0,0 +1,222 @@
+"""Shared collector: polls GitHub and runs cava once for every open TuxApp.
+
+Run with `python3 -m tuxd`. Apps that find its socket at startup subscribe to
+it instead of polling and spawning cava themselves.
+
+Messages in both directions are a 1-byte type and a 4-byte big-endian payload
+length, then the payload. The daemon sends HELLO (JSON: bars, sample_size)
+once, then STATE (JSON snapshot) after every poll and FRAME (raw spectrum
+samples) as cava produces them. Clients may send PAUSE and RESUME to stop and
+restart their frames.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import struct
+import sys
+
+HEADER = struct.Struct("!BI")
+HELLO, STATE, FRAME, PAUSE, RESUME = range(1, 6)
+
+
+def write_message(writer, kind, payload=b""):
+    writer.write(HEADER.pack(kind, len(payload)))
+    writer.write(payload)
+
+
+async def read_message(reader):
+    kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return kind, await reader.readexactly(length)
+
+
+class Subscriber:
+    """A connected client and the newest state and frame not yet sent to it.
+
+    Each subscriber has its own writer task, so a client that reads slowly
+    only stalls itself. It skips to the latest frame instead of queueing.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.paused = False
+        self.state = None
+        self.frame = None
+        self.frames_dropped = 0
+        self._wake = asyncio.Event()
+
+    def send(self, state=None, frame=None):
+        if state is not None:
+            self.state = state
+        if frame is not None:
+            if self.frame is not None:
+                self.frames_dropped += 1
+            self.frame = frame
+        self._wake.set()
+
+    async def run(self):
+        try:
+            while True:
+                await self._wake.wait()
+                self._wake.clear()
+                if self.state is not None:
+                    write_message(self.writer, STATE, self.state)
+                    self.state = None
+                if self.frame is not None:
+                    write_message(self.writer, FRAME, self.frame)
+                    self.frame = None
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+class Collector:
+    """Polls GitHub and reads spectrum frames, publishing both to subscribers."""
+
+    def __init__(self, config):
+        # Deferred so that clients importing the protocol skip aiohttp and sqlite
+        from config import get_repos
+        from github_poller import GitHubPoller
+        from snapshot import load_snapshot
+        from textual_app.spectrum import make_backend
+        from textual_app.tux import Tux
+
+        self.config = config
+        github = config["github"]
+        self.tux = Tux(
+            username=github["username"],
+            repo=github.get("repo"),
+            repos=get_repos(config),
+        )
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            self.tux.restore_snapshot(snapshot)
+        self.poller = GitHubPoller(config, self.tux, on_poll=self.on_poll)
+        if snapshot is not None:
+            self.poller.last_poll = snapshot.get("last_poll")
+        self.backend = make_backend(config["cava"])
+        self.backend.set_bars(config["daemon"]["bars"])
+        self.subscribers = set()
+        self.connections = set()
+        self.state = self.encode_state()
+        self._backend_paused = False
+        # cava only runs while some subscriber wants frames
+        self.update_backend()
+
+    def snapshot(self) -> dict:
+        return {**self.tux.to_snapshot(), "last_poll": self.poller.last_poll}
+
+    def encode_state(self) -> bytes:
+        state = {
+            **self.snapshot(),
+            # Includes repos resolved through `all_repos`
+            "repos": self.tux.repos,
+            # Changes whenever clients should reload the commit history
+            "history": len(self.tux.commit_index),
+        }
+        return json.dumps(state).encode()
+
+    async def on_poll(self, new_commit, index_changed) -> None:
+        from snapshot import save_snapshot
+
+        self.state = self.encode_state()
+        for subscriber in self.subscribers:
+            subscriber.send(state=self.state)
+        try:
+            await asyncio.to_thread(save_snapshot, self.snapshot())
+        except OSError as e:
+            print("Failed to save snapshot:", e, file=sys.stderr)
+
+    def update_backend(self) -> None:
+        paused = all(s.paused for s in self.subscribers)
+        if paused == self._backend_paused:
+            return
+        self._backend_paused = paused
+        if paused:
+            self.backend.pause()
+        else:
+            self.backend.resume()
+
+    async def pump_frames(self) -> None:
+        async for frame in self.backend.frames():
+            for subscriber in self.subscribers:
+                if not subscriber.paused:
+                    subscriber.send(frame=frame)
+
+    async def on_connect(self, reader, writer) -> None:
+        hello = {
+            "bars": self.backend.bars,
+            "sample_size": self.backend.sample_size,
+        }
+        write_message(writer, HELLO, json.dumps(hello).encode())
+        subscriber = Subscriber(writer)
+        self.connections.add(asyncio.current_task())
+        subscriber.send(state=self.state)
+        self.subscribers.add(subscriber)
+        self.update_backend()
+        writer_task = asyncio.create_task(subscriber.run())
+        try:
+            while True:
+                kind, _ = await read_message(reader)
+                if kind in (PAUSE, RESUME):
+                    subscriber.paused = kind == PAUSE
+                    self.update_backend()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.discard(asyncio.current_task())
+            self.subscribers.discard(subscriber)
+            self.update_backend()
+            writer_task.cancel()
+            writer.close()
+
+    async def serve(self, path) -> None:
+        if os.path.exists(path):
+            try:
+                _, writer = await asyncio.open_unix_connection(path)
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.remove(path)
+            else:
+                writer.close()
+                raise SystemExit(f"tuxd is already running on {path}")
+        server = await asyncio.start_unix_server(self.on_connect, path)
+        os.chmod(path, 0o600)
+        print("tuxd listening on", path)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        tasks = [
+            asyncio.create_task(self.poller.run()),
+            asyncio.create_task(self.pump_frames()),
+        ]
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            os.remove(path)
+            # Hang up on clients, dropping unsent data a stalled one would
+            # otherwise hold us on; their handlers then return
+            connections = list(self.connections)
+            for subscriber in self.subscribers:
+                subscriber.writer.transport.abort()
+            await asyncio.gather(*connections, return_exceptions=True)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.backend.close()
+            await self.poller.close()
+
+
+def main():
+    from config import load_config
+
+    config = load_config()
+    asyncio.run(Collector(config).serve(config["daemon"]["socket"]))
+
+
+if __name__ == "__main__":
+    main()